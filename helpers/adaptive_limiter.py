@@ -0,0 +1,158 @@
+"""
+Adaptive concurrency limit and jittered backoff for calls to the Automation Server API.
+
+The limiter follows AIMD (additive increase, multiplicative decrease): while requests succeed
+with latencies close to the best seen so far for requests of their size, the limit grows by about one per round trip; when
+the backend throttles or fails, it is halved, and when latency climbs it is reduced gently. The
+number of requests in flight then settles near what the backend can actually serve, instead of
+a fixed number of workers that all retry in lockstep.
+
+Usage:
+    limiter = AdaptiveLimiter()
+    async with limiter:
+        start = time.monotonic()
+        try:
+            await send(batch)
+            await limiter.record(time.monotonic() - start, size=len(batch))
+        except Exception:
+            await limiter.record(time.monotonic() - start, error=True, size=len(batch))
+"""
+
+import asyncio
+import random
+import time
+
+from helpers import config
+
+# Seconds after which the latency baseline is reset to the lowest latency of the last window
+BASELINE_WINDOW = 30.0
+
+
+def backoff_delay(attempt: int, retry_after: str | float | None = None) -> float:
+    """
+    Delay before retry number `attempt`, with full jitter so clients that failed together
+    do not retry together. A Retry-After value from the server is respected, plus a little
+    jitter on top.
+
+    Args:
+        attempt (int): The attempt that just failed, starting at 1.
+        retry_after (str | float | None): The Retry-After header or value in seconds, if any.
+    """
+    if retry_after is not None:
+        try:
+            return float(retry_after) + random.uniform(0, config.RETRY_BASE_DELAY)
+        except ValueError:
+            pass
+
+    ceiling = min(config.MAX_BACKOFF, config.RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+class AdaptiveLimiter:  # pylint: disable=too-many-instance-attributes
+    """
+    An asyncio concurrency limit that adapts to the latency and error rate of the backend.
+
+    Attributes:
+        min_limit (int): The limit never drops below this.
+        max_limit (int): The limit never grows above this.
+        latency_tolerance (float): Latencies above this multiple of the baseline count as congestion.
+    """
+
+    def __init__(
+        self,
+        min_limit: int = config.MIN_CONCURRENCY,
+        max_limit: int = config.MAX_CONCURRENCY,
+        initial_limit: int = config.INITIAL_CONCURRENCY,
+        latency_tolerance: float = config.LATENCY_TOLERANCE,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        # Latency baselines and the lowest latencies of the current window, per request size bucket
+        self._baselines: dict[int, float] = {}
+        self._window_mins: dict[int, float] = {}
+        self._window_start = time.monotonic()
+        self._last_baseline = 0.0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of slots currently held."""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot under the current limit."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        """Give a slot back."""
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_tb):
+        await self.release()
+
+    async def record(self, latency: float, error: bool = False, throttled: bool = False, size: int = 1) -> None:
+        """
+        Adjust the limit after a request.
+
+        Args:
+            latency (float): Seconds the request took.
+            error (bool): The request failed in a way that suggests overload (timeout, 5xx).
+            throttled (bool): The backend asked us to slow down (429/503).
+            size (int): Number of items the request carried. Latency is only compared with requests of a similar size.
+        """
+        now = time.monotonic()
+        previous = self.limit
+
+        if error or throttled:
+            self._decrease(now, 0.5)
+            return
+
+        # A request of 500 items takes longer than one of 1 item without any congestion, so each power of
+        # two of request size has its own baseline. The baseline is the lowest latency seen for the bucket.
+        # It drops at once, and is replaced by the lowest latency of the last window every BASELINE_WINDOW
+        # seconds, so it can also rise if the backend got slower.
+        bucket = max(size, 1).bit_length()
+        baseline = min(self._baselines.get(bucket, latency), latency)
+        self._baselines[bucket] = baseline
+        self._window_mins[bucket] = min(self._window_mins.get(bucket, latency), latency)
+        if now - self._window_start >= BASELINE_WINDOW:
+            self._baselines.update(self._window_mins)
+            self._window_mins, self._window_start = {}, now
+
+        self._last_baseline = baseline
+        if latency > baseline * self.latency_tolerance:
+            self._decrease(now, 0.9)
+        else:
+            self._set_limit(self._limit + 1 / self._limit)
+
+        if self.limit > previous:
+            async with self._condition:
+                self._condition.notify_all()
+
+    def _decrease(self, now: float, factor: float) -> None:
+        # Requests that were already in flight report the same congestion, so cut at most once per round trip
+        if now - self._last_decrease < self._last_baseline * self.latency_tolerance:
+            return
+        self._last_decrease = now
+        self._set_limit(self._limit * factor)
+
+    def _set_limit(self, limit: float) -> None:
+        self._limit = min(max(limit, self.min_limit), self.max_limit)
@@ -1,18 +1,33 @@
 """Helper module to call some functionality in Automation Server using the API"""
 
 import logging
+import math
 import os
+import sqlite3
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from functools import cache
+from itertools import islice
 
 import requests
 from automation_server_client import WorkItem, Workqueue
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
+from helpers import config
+from helpers.adaptive_limiter import backoff_delay
 
-def get_workqueue_items(workqueue: Workqueue):
-    """
-    Retrieve items from the specified workqueue.
-    If the queue is empty, return an empty list.
-    """
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+@cache
+def _ats_settings() -> tuple[str, str]:
+    """Load the Automation Server url and token from the environment, reading .env only once."""
     load_dotenv()
 
     url = os.getenv("ATS_URL")
@@ -21,30 +36,328 @@ def get_workqueue_items(workqueue: Workqueue):
     if not url or not token:
         raise OSError("ATS_URL or ATS_TOKEN is not set in the environment")
 
-    headers = {"Authorization": f"Bearer {token}"}
+    return url, token
+
+
+@cache
+def _ats_session() -> requests.Session:
+    """Shared session, so page requests reuse pooled connections instead of opening a new one each time."""
+    _, token = _ats_settings()
+
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.MAX_CONCURRENCY)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
 
-    workqueue_items = set()
-    page = 1
-    size = 200  # max allowed
 
+def _fetch_items_page(workqueue_id: int, page: int) -> dict:
+    """
+    Fetch one page of items from a workqueue, retrying with exponential backoff on
+    connection errors, timeouts, throttling and server errors.
+    """
+    url, _ = _ats_settings()
+    size = config.WORKQUEUE_PAGE_SIZE
+
+    attempt = 0
     while True:
-        full_url = f"{url}/workqueues/{workqueue.id}/items?page={page}&size={size}"
-        response = requests.get(full_url, headers=headers, timeout=60)
-        response.raise_for_status()
+        attempt += 1
+        try:
+            response = _ats_session().get(
+                f"{url}/workqueues/{workqueue_id}/items?page={page}&size={size}", timeout=60
+            )
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= config.MAX_RETRIES:
+                response.raise_for_status()
+                return response.json()
+            retry_after = response.headers.get("Retry-After", "")
+            error = f"HTTP {response.status_code}"
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= config.MAX_RETRIES:
+                raise
+            retry_after = ""
+            error = str(e)
+
+        backoff = backoff_delay(attempt, retry_after or None)
+        logger.warning(
+            f"Error fetching page {page} of workqueue {workqueue_id} (attempt {attempt}/{config.MAX_RETRIES}). "
+            f"Retrying in {backoff:.2f}s... {error}"
+        )
+        time.sleep(backoff)
+
+
+def _total_pages(payload: dict) -> int | None:
+    """Page count reported by a page response, or None if the response does not include it."""
+    if payload.get("total_pages") is not None:
+        return int(payload["total_pages"])
+
+    total_items = payload.get("total_items", payload.get("total"))
+    if total_items is not None:
+        return math.ceil(int(total_items) / config.WORKQUEUE_PAGE_SIZE)
+
+    return None
+
 
-        res_json = response.json().get("items", [])
+def _iter_item_pages(
+    workqueue_id: int,
+    first_page: int = 1,
+    max_workers: int = config.WORKQUEUE_PAGE_CONCURRENCY,
+    ordered: bool = True,
+) -> Iterator[tuple[int, list[dict]]]:
+    """
+    Yield (page, items) for the pages of a workqueue from first_page on.
+
+    The first page is fetched alone to learn the page count, and the remaining pages are
+    then fetched concurrently with at most max_workers requests in flight. With ordered
+    set, pages are yielded in page order; otherwise as soon as they arrive. If the API
+    does not report a page count, pages are fetched one at a time until a short page.
+    """
+    payload = _fetch_items_page(workqueue_id, first_page)
+    items = payload.get("items", [])
+    yield first_page, items
+
+    total = _total_pages(payload)
+    size = config.WORKQUEUE_PAGE_SIZE
+
+    if total is None:
+        page = first_page
+        while len(items) == size:
+            page += 1
+            items = _fetch_items_page(workqueue_id, page).get("items", [])
+            yield page, items
+        return
+
+    remaining = iter(range(first_page + 1, total + 1))
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        pending = {}
+        for page in islice(remaining, max_workers):
+            pending[pool.submit(_fetch_items_page, workqueue_id, page)] = page
+
+        try:
+            while pending:
+                if ordered:
+                    done = [min(pending, key=pending.get)]
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    page = pending.pop(future)
+                    next_page = next(remaining, None)
+                    if next_page is not None:
+                        pending[pool.submit(_fetch_items_page, workqueue_id, next_page)] = next_page
+                    yield page, future.result().get("items", [])
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_workqueue_items(
+    workqueue: Workqueue,
+    references_only: bool = False,
+    max_workers: int = config.WORKQUEUE_PAGE_CONCURRENCY,
+) -> Iterator[dict | str]:
+    """
+    Yield the items of a workqueue as their pages arrive, fetching pages concurrently.
+    Items are not yielded in queue order.
+
+    Args:
+        workqueue (Workqueue): The workqueue to read.
+        references_only (bool): Yield only the non-empty references instead of the items.
+        max_workers (int): Maximum number of pages fetched at the same time.
+    """
+    for _, items in _iter_item_pages(workqueue.id, max_workers=max_workers, ordered=False):
+        if references_only:
+            yield from (item["reference"] for item in items if item.get("reference"))
+        else:
+            yield from items
+
+
+def add_workqueue_items(workqueue_id: int, items: list[dict]) -> list[str]:
+    """
+    Add several items to a workqueue in one request to the bulk endpoint.
 
-        if not res_json:
-            break
+    Args:
+        workqueue_id (int): Id of the workqueue.
+        items (list[dict]): Items as {"reference": str, "data": dict}.
 
-        for row in res_json:
-            ref = row.get("reference")
-            if ref:
-                workqueue_items.add(ref)
+    Returns:
+        list[str]: References the server reported as not added. Empty if all items were added.
 
-        page += 1
+    Raises:
+        requests.HTTPError: If the whole request was rejected.
+    """
+    url, _ = _ats_settings()
+
+    response = _ats_session().post(
+        f"{url}/workqueues/{workqueue_id}/{config.WORKQUEUE_BULK_ENDPOINT}", json=items, timeout=120
+    )
+    response.raise_for_status()
+
+    payload = response.json() if response.content else {}
+    failed = payload.get("failed", []) if isinstance(payload, dict) else []
+
+    return [entry.get("reference") if isinstance(entry, dict) else entry for entry in failed]
+
+
+class WorkqueueReferenceIndex:
+    """
+    Persistent local index of the references in a workqueue, kept in SQLite.
+
+    Items are listed by the API oldest first, so each sync resumes at the page holding the
+    first item not seen yet and only fetches newer items. The sync marker is the number of
+    items and the highest item id seen. If items were removed from the queue, the pages
+    shift and the first resumed item is newer than the marker; the index is then rebuilt
+    from the first page.
+
+    Queues are keyed by the Automation Server url (ATS_URL) and the workqueue id, so servers
+    with the same queue ids (e.g. dev and prod) keep separate references in the same file.
+    """
+
+    # Bumped when the tables change; an index file with another version is rebuilt
+    SCHEMA_VERSION = 1
+
+    def __init__(self, workqueue_id: int, db_path: str = config.WORKQUEUE_INDEX_PATH):
+        self.workqueue_id = workqueue_id
+        self.db_path = db_path
+        self.server = _ats_settings()[0].rstrip("/")
+        self._key = (self.server, workqueue_id)
+
+        with closing(self._connect()) as conn:
+            with conn:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS refs")
+                    conn.execute("DROP TABLE IF EXISTS sync_state")
+                    conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS refs ("
+                    "server TEXT NOT NULL, workqueue_id INTEGER NOT NULL, reference TEXT NOT NULL, "
+                    "PRIMARY KEY (server, workqueue_id, reference)) WITHOUT ROWID"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sync_state ("
+                    "server TEXT NOT NULL, workqueue_id INTEGER NOT NULL, item_count INTEGER NOT NULL, "
+                    "last_item_id INTEGER, PRIMARY KEY (server, workqueue_id))"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _marker(self, conn: sqlite3.Connection) -> tuple[int, int | None]:
+        row = conn.execute(
+            "SELECT item_count, last_item_id FROM sync_state WHERE server = ? AND workqueue_id = ?",
+            self._key,
+        ).fetchone()
+        return row if row else (0, None)
+
+    def clear(self) -> None:
+        """Drop all references and the sync marker of the workqueue."""
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute("DELETE FROM refs WHERE server = ? AND workqueue_id = ?", self._key)
+                conn.execute("DELETE FROM sync_state WHERE server = ? AND workqueue_id = ?", self._key)
+
+    def sync(self) -> int:
+        """
+        Fetch the items added to the workqueue since the last sync and store their references.
+
+        Returns:
+            int: Number of new references stored.
+        """
+        size = config.WORKQUEUE_PAGE_SIZE
+        added = 0
+
+        with closing(self._connect()) as conn:
+            item_count, last_item_id = self._marker(conn)
+
+            # Resume at the page holding the last item seen, or start over without a marker
+            if item_count and last_item_id is not None:
+                page = (item_count - 1) // size + 1
+            else:
+                page = 1
+            position = (page - 1) * size
+            resuming = page > 1 or item_count > 0
+
+            while True:
+                restart = False
+
+                for page, items in _iter_item_pages(self.workqueue_id, page):
+                    if resuming:
+                        resuming = False
+                        last_seen = item_count - 1 - position
+                        if 0 <= last_seen and (len(items) <= last_seen or items[last_seen].get("id") != last_item_id):
+                            restart = True
+                            break
+
+                    if not items:
+                        break
+
+                    with conn:
+                        added += conn.executemany(
+                            "INSERT OR IGNORE INTO refs (server, workqueue_id, reference) VALUES (?, ?, ?)",
+                            ((*self._key, item["reference"]) for item in items if item.get("reference")),
+                        ).rowcount
+                        position = (page - 1) * size + len(items)
+                        conn.execute(
+                            "INSERT OR REPLACE INTO sync_state (server, workqueue_id, item_count, last_item_id) "
+                            "VALUES (?, ?, ?, ?)",
+                            (*self._key, position, items[-1].get("id")),
+                        )
+
+                if not restart:
+                    break
+
+                logger.info(
+                    f"Workqueue {self.workqueue_id} changed since the last sync, rebuilding the reference index"
+                )
+                with conn:
+                    conn.execute("DELETE FROM refs WHERE server = ? AND workqueue_id = ?", self._key)
+                    conn.execute("DELETE FROM sync_state WHERE server = ? AND workqueue_id = ?", self._key)
+                page, position, item_count = 1, 0, 0
+
+        return added
+
+    def references(self) -> set[str]:
+        """All references stored for the workqueue."""
+        with closing(self._connect()) as conn:
+            return {
+                row[0]
+                for row in conn.execute(
+                    "SELECT reference FROM refs WHERE server = ? AND workqueue_id = ?", self._key
+                )
+            }
+
+    def contains(self, references: list[str]) -> set[str]:
+        """The subset of the given references that are already in the workqueue."""
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TEMP TABLE candidates (reference TEXT PRIMARY KEY) WITHOUT ROWID")
+            conn.executemany(
+                "INSERT OR IGNORE INTO candidates VALUES (?)", ((ref,) for ref in references)
+            )
+            return {
+                row[0]
+                for row in conn.execute(
+                    "SELECT c.reference FROM candidates c "
+                    "JOIN refs r ON r.server = ? AND r.workqueue_id = ? AND r.reference = c.reference",
+                    self._key,
+                )
+            }
+
+
+def get_workqueue_items(workqueue: Workqueue, db_path: str = config.WORKQUEUE_INDEX_PATH):
+    """
+    Retrieve the references of the items in the specified workqueue.
+    The references are kept in a local index, and only items added since the last call are fetched.
+    If the queue is empty, return an empty set.
+    """
+    index = WorkqueueReferenceIndex(workqueue.id, db_path)
+    index.sync()
 
-    return workqueue_items
+    return index.references()
 
 
 def get_item_info(item: WorkItem):
@@ -5,6 +5,30 @@ MAX_RETRY = 10
 # ----------------------
 # Queue population settings
 # ----------------------
-MAX_CONCURRENCY = 100  # tune based on backend capacity
+MIN_CONCURRENCY = 1  # lower bound of the adaptive concurrency limit
+MAX_CONCURRENCY = 100  # upper bound of the adaptive concurrency limit
+INITIAL_CONCURRENCY = 4  # starting point, the limit adapts to the backend from here
+LATENCY_TOLERANCE = 2.0  # latency above this multiple of the best seen counts as congestion
 MAX_RETRIES = 3  # transient failure retries per item
-RETRY_BASE_DELAY = 0.5  # seconds (exponential backoff)
+RETRY_BASE_DELAY = 0.5  # seconds (exponential backoff with full jitter)
+MAX_BACKOFF = 30.0  # seconds, cap for a single backoff without Retry-After
+ENQUEUE_BATCH_SIZE = 500  # items sent per bulk request
+ENQUEUE_BUFFER_SIZE = 5000  # items read ahead from the source while earlier batches are sent
+WORKQUEUE_BULK_ENDPOINT = "items/bulk"  # relative to /workqueues/{id}/
+
+# ----------------------
+# Workqueue reference index
+# ----------------------
+WORKQUEUE_INDEX_PATH = "workqueue_index.sqlite3"  # local SQLite file with the references already in each queue
+WORKQUEUE_PAGE_SIZE = 200  # max allowed by the API
+WORKQUEUE_PAGE_CONCURRENCY = 8  # pages fetched in parallel once the page count is known
+
+# ----------------------
+# Work item processing
+# ----------------------
+WORKER_COUNT = 4  # items processed in parallel, each worker with its own SharePoint client
+
+# ----------------------
+# SharePoint settings
+# ----------------------
+SITE_PROBE_CONCURRENCY = 8  # sites authenticated and probed in parallel at startup
@@ -0,0 +1,132 @@
+"""
+Process-wide certificate credential and token cache for SharePoint app-only authentication.
+
+Every Sharepoint instance authenticates with the same tenant, client id and certificate. Instead of
+letting each ClientContext re-read the PEM file and acquire its own token, the credential is parsed
+once per (tenant, client_id, thumbprint) and the resulting tokens are shared by all instances until
+shortly before they expire.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import msal
+
+AUTHORITY_URL = "https://login.microsoftonline.com"
+
+# Tokens are refreshed this many seconds before they actually expire
+TOKEN_REFRESH_MARGIN = 300
+
+
+class CertificateCredential:
+    """
+    A certificate based app-only credential that caches one access token per scope.
+
+    Attributes:
+        tenant (str): Tenant name or id.
+        client_id (str): Client id of the app registration.
+        thumbprint (str): Thumbprint of the certificate.
+    """
+
+    def __init__(self, tenant: str, client_id: str, thumbprint: str, cert_path: str):
+        """Reads the certificate once and prepares the MSAL application."""
+        self.tenant = tenant
+        self.client_id = client_id
+        self.thumbprint = thumbprint
+
+        with open(cert_path, "r", encoding="utf8") as cert_file:
+            private_key = cert_file.read()
+
+        self._app = msal.ConfidentialClientApplication(
+            client_id,
+            authority=f"{AUTHORITY_URL}/{tenant}",
+            client_credential={"thumbprint": thumbprint, "private_key": private_key},
+        )
+        self._tokens: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, scope: str) -> Dict[str, Any]:
+        """
+        Returns a valid token for the given scope, acquiring a new one only when needed.
+
+        Args:
+            scope (str): The scope to request, e.g. "https://contoso.sharepoint.com/.default".
+
+        Returns:
+            Dict[str, Any]: The token response, with "expires_in" set to the remaining lifetime
+                            minus the refresh margin.
+        """
+        with self._lock:
+            cached = self._tokens.get(scope)
+            now = time.monotonic()
+
+            if cached is None or now >= cached[1]:
+                result = self._app.acquire_token_for_client([scope])
+                if "access_token" not in result:
+                    raise PermissionError(
+                        f"Failed to acquire token for {scope}: {result.get('error_description') or result.get('error')}"
+                    )
+
+                expires_at = now + max(int(result.get("expires_in", 0)) - TOKEN_REFRESH_MARGIN, 0)
+                cached = (result, expires_at)
+                self._tokens[scope] = cached
+
+            token, expires_at = cached
+
+            return {
+                "access_token": token["access_token"],
+                "token_type": token.get("token_type", "Bearer"),
+                "expires_in": max(int(expires_at - now), 0),
+            }
+
+    def token_provider(self, site_url: str) -> Callable[[], Dict[str, Any]]:
+        """
+        Returns a callback for ClientContext.with_access_token that serves tokens for the site's tenant.
+
+        Args:
+            site_url (str): Any url on the SharePoint host, e.g. "https://contoso.sharepoint.com/teams/site".
+        """
+        parts = urlsplit(site_url)
+        scope = f"{parts.scheme}://{parts.netloc}/.default"
+
+        return lambda: self.get_token(scope)
+
+
+_credentials: Dict[Tuple[str, str, str], CertificateCredential] = {}
+_credentials_lock = threading.Lock()
+
+
+def get_certificate_credential(
+    tenant: str, client_id: str, thumbprint: str, cert_path: str
+) -> CertificateCredential:
+    """
+    Returns the shared credential for (tenant, client_id, thumbprint), creating it on first use.
+
+    Args:
+        tenant (str): Tenant name or id.
+        client_id (str): Client id of the app registration.
+        thumbprint (str): Thumbprint of the certificate.
+        cert_path (str): Path to the PEM encoded certificate. Only read the first time the key is seen.
+
+    Returns:
+        CertificateCredential: The cached credential.
+    """
+    key = (tenant, client_id, thumbprint)
+
+    with _credentials_lock:
+        credential = _credentials.get(key)
+        if credential is None:
+            credential = CertificateCredential(tenant, client_id, thumbprint, cert_path)
+            _credentials[key] = credential
+
+    return credential
+
+
+def clear_credentials(tenant: Optional[str] = None) -> None:
+    """Drops cached credentials and tokens, for all tenants or a single one."""
+    with _credentials_lock:
+        for key in list(_credentials):
+            if tenant is None or key[0] == tenant:
+                del _credentials[key]
@@ -0,0 +1,247 @@
+"""
+Batching of SharePoint REST operations: list, read, small upload and delete operations are queued and sent
+as multipart $batch requests of up to 100 operations, instead of one round trip per operation.
+
+Usage:
+    with sp.batch(batch_size=50) as batch:
+        files = batch.list_files("FolderName")
+        content = batch.read_file("report.xlsx", "FolderName")
+    print(files.result, content.result)
+"""
+
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from office365.runtime.http.http_method import HttpMethod
+from office365.runtime.http.request_options import RequestOptions
+
+from helpers.sharepoint_rest import RETRY_BASE_DELAY, THROTTLING_STATUS_CODES, odata_path
+
+if TYPE_CHECKING:
+    from helpers.sharepoint_class import Sharepoint
+
+
+@dataclass
+class BatchOperation:  # pylint: disable=too-many-instance-attributes
+    """A single operation queued in a SharepointBatch, holding its result once the batch has run"""
+
+    kind: str
+    method: str
+    url: str
+    body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    status: Optional[int] = None
+    response_headers: Dict[str, str] = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """True if SharePoint answered the operation with a 2xx status."""
+        return self.status is not None and 200 <= self.status < 300
+
+
+def _parse_multipart(body: bytes, boundary: str) -> List[Tuple[Dict[str, str], bytes]]:
+    """Splits a multipart body into (headers, content) parts."""
+    parts = []
+    for raw_part in body.split(f"--{boundary}".encode())[1:]:
+        if raw_part.startswith(b"--"):
+            break
+        raw_part = raw_part.removeprefix(b"\r\n").removesuffix(b"\r\n")
+        head, _, content = raw_part.partition(b"\r\n\r\n")
+        headers = {}
+        for line in head.decode().split("\r\n"):
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        parts.append((headers, content))
+    return parts
+
+
+def _parse_batch_response(body: bytes, content_type: str) -> List[Tuple[int, Dict[str, str], bytes]]:
+    """
+    Parses a $batch response into (status, headers, body) tuples, in the order of the request.
+    Change set responses are flattened into the list.
+    """
+    boundary = content_type.split("boundary=", 1)[1].split(";", 1)[0].strip()
+    responses = []
+    for headers, content in _parse_multipart(body, boundary):
+        part_type = headers.get("content-type", "")
+        if part_type.startswith("multipart/mixed"):
+            responses.extend(_parse_batch_response(content, part_type))
+            continue
+
+        head, _, response_body = content.partition(b"\r\n\r\n")
+        status_line, *header_lines = head.decode().split("\r\n")
+        response_headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        responses.append((int(status_line.split(" ")[1]), response_headers, response_body))
+    return responses
+
+
+class SharepointBatch:
+    """
+    Queues list, read, small upload and delete operations and sends them to SharePoint as $batch requests.
+    Use it through Sharepoint.batch(); the queued operations are sent when the with block exits.
+
+    Example:
+        with sp.batch(batch_size=50) as batch:
+            files = batch.list_files("FolderName")
+            content = batch.read_file("report.xlsx", "FolderName")
+        print(files.result, content.result)
+    """
+
+    def __init__(self, sharepoint: "Sharepoint", batch_size: int = 100, max_retries: int = 3):
+        """
+        Args:
+            sharepoint (Sharepoint): The authenticated Sharepoint instance.
+            batch_size (int): Maximum number of operations sent per $batch request (SharePoint allows 100).
+            max_retries (int): Retries for operations throttled with HTTP 429/503.
+        """
+        self.sharepoint = sharepoint
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.operations: List[BatchOperation] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    def _url(self, endpoint: str) -> str:
+        return f"{self.sharepoint.ctx.service_root_url}/web/{endpoint}"
+
+    def _queue(self, operation: BatchOperation) -> BatchOperation:
+        self.operations.append(operation)
+        return operation
+
+    def list_files(self, folder_name: str) -> BatchOperation:
+        """Queues a listing of the files in a folder. The result is a list of file dictionaries."""
+        folder_url = f"/teams/{self.sharepoint.site_name}/{self.sharepoint.document_library}/{folder_name}"
+        return self._queue(BatchOperation(
+            "list",
+            "GET",
+            self._url(f"getFolderByServerRelativePath(DecodedUrl='{odata_path(folder_url)}')/Files"
+                      "?$select=Name,ServerRelativeUrl,Length,TimeLastModified,ETag"),
+        ))
+
+    def read_file(self, file_name: str, folder_name: str) -> BatchOperation:
+        """Queues a download of a file. The result is the binary content of the file."""
+        file_url = f"/teams/{self.sharepoint.site_name}/{self.sharepoint.document_library}/{folder_name}/{file_name}"
+        return self._queue(BatchOperation(
+            "read",
+            "GET",
+            self._url(f"getFileByServerRelativePath(DecodedUrl='{odata_path(file_url)}')/$value"),
+        ))
+
+    def upload_file(self, binary_content: bytes, file_name: str, folder_name: str) -> BatchOperation:
+        """Queues an upload of a small file, overwriting an existing file with the same name."""
+        folder_url = f"/teams/{self.sharepoint.site_name}/{self.sharepoint.document_library}/{folder_name}"
+        return self._queue(BatchOperation(
+            "upload",
+            "POST",
+            self._url(f"getFolderByServerRelativePath(DecodedUrl='{odata_path(folder_url)}')"
+                      f"/Files/AddUsingPath(DecodedUrl='{odata_path(file_name)}',Overwrite=true)"),
+            body=binary_content,
+            headers={"Content-Type": "application/octet-stream"},
+        ))
+
+    def delete_file(self, file_name: str, folder_name: str) -> BatchOperation:
+        """Queues a deletion of a file."""
+        file_url = f"/teams/{self.sharepoint.site_name}/{self.sharepoint.document_library}/{folder_name}/{file_name}"
+        return self._queue(BatchOperation(
+            "delete",
+            "DELETE",
+            self._url(f"getFileByServerRelativePath(DecodedUrl='{odata_path(file_url)}')"),
+            headers={"If-Match": "*"},
+        ))
+
+    def _build_body(self, operations: List[BatchOperation], boundary: str) -> bytes:
+        """Builds the multipart body of a $batch request. Each write gets its own change set, so one failing write does not roll back the others."""
+        body = b""
+        for operation in operations:
+            request = f"{operation.method} {operation.url} HTTP/1.1\r\nAccept: application/json;odata=nometadata\r\n"
+            for name, value in operation.headers.items():
+                request += f"{name}: {value}\r\n"
+            request = request.encode() + b"\r\n" + (operation.body or b"")
+            http_part = b"Content-Type: application/http\r\nContent-Transfer-Encoding: binary\r\n\r\n" + request + b"\r\n"
+
+            if operation.method == "GET":
+                body += f"--{boundary}\r\n".encode() + http_part
+            else:
+                changeset = f"changeset_{uuid.uuid4()}"
+                body += (
+                    f"--{boundary}\r\nContent-Type: multipart/mixed; boundary={changeset}\r\n\r\n"
+                    f"--{changeset}\r\n"
+                ).encode() + http_part + f"--{changeset}--\r\n".encode()
+        return body + f"--{boundary}--\r\n".encode()
+
+    def _send(self, operations: List[BatchOperation]):
+        """Sends one $batch request and stores the status and result on each operation."""
+        boundary = f"batch_{uuid.uuid4()}"
+        request = RequestOptions(
+            f"{self.sharepoint.ctx.service_root_url}/$batch",
+            method=HttpMethod.Post,
+            data=self._build_body(operations, boundary),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        response, _ = self.sharepoint.send_with_retry(
+            lambda: self.sharepoint.ctx.pending_request().execute_request_direct(request), self.max_retries
+        )
+
+        parts = _parse_batch_response(response.content, response.headers["Content-Type"])
+
+        # Parts are matched to operations by position, so an operation without a part gets an error instead of no status
+        for operation in operations[len(parts):]:
+            operation.error = f"No response for this operation in the $batch response ({len(parts)} parts for {len(operations)} operations)"
+
+        for operation, (status, headers, body) in zip(operations, parts):
+            operation.status = status
+            operation.response_headers = headers
+            operation.error = None
+            if not operation.success:
+                operation.error = body.decode(errors="replace")
+            elif operation.kind == "read":
+                operation.result = body
+            elif operation.kind == "list":
+                operation.result = json.loads(body).get("value", [])
+            else:
+                operation.result = True
+
+    def execute(self) -> List[BatchOperation]:
+        """
+        Sends all queued operations in $batch requests of at most batch_size operations.
+        Operations throttled by SharePoint are resent in a later batch, up to max_retries times.
+
+        Returns:
+            List[BatchOperation]: The operations, in the order they were queued, with status and result set.
+        """
+        pending = [operation for operation in self.operations if operation.status is None]
+
+        for attempt in range(1, self.max_retries + 2):
+            for i in range(0, len(pending), self.batch_size):
+                chunk = pending[i:i + self.batch_size]
+                try:
+                    self._send(chunk)
+                except Exception as e:
+                    for operation in chunk:
+                        operation.error = str(e)
+
+            throttled = [operation for operation in pending if operation.status in THROTTLING_STATUS_CODES]
+            if not throttled or attempt > self.max_retries:
+                break
+
+            retry_after = max(
+                (int(value) for value in (operation.response_headers.get("retry-after", "") for operation in throttled) if value.isdigit()),
+                default=0,
+            )
+            time.sleep(retry_after or RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+            pending = throttled
+
+        return self.operations
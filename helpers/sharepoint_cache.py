@@ -0,0 +1,171 @@
+"""
+A local download cache for SharePoint files, validated with ETags.
+
+Files are stored on disk under a hash of their server relative url, next to a small metadata file holding
+the url and ETag. The disk tier is bounded in size and evicts the least recently used files first, and
+small files are additionally kept in a bounded memory tier so repeated reads skip the disk as well.
+
+Usage:
+    cache = FileCache("C:\\Temp\\sharepoint_cache")
+    sp = Sharepoint(**sharepoint_details, file_cache=cache)
+    sp.fetch_file_using_open_binary("lookup.xlsx", "Templates")  # full download
+    sp.fetch_file_using_open_binary("lookup.xlsx", "Templates")  # one conditional request, served from cache
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB on disk
+DEFAULT_MEMORY_MAX_BYTES = 64 * 1024 * 1024  # 64 MB in memory
+DEFAULT_MEMORY_MAX_FILE_BYTES = 1024 * 1024  # files up to 1 MB are kept in memory
+
+
+class FileCache:  # pylint: disable=too-many-instance-attributes
+    """
+    A size-bounded LRU cache of file contents keyed by server relative url.
+
+    Attributes:
+        cache_dir (str): Directory where cached files are stored.
+        max_bytes (int): Maximum total size of the files kept on disk.
+        memory_max_bytes (int): Maximum total size of the files kept in memory.
+        memory_max_file_bytes (int): Files up to this size are also kept in memory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        memory_max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+        memory_max_file_bytes: int = DEFAULT_MEMORY_MAX_FILE_BYTES,
+    ):
+        """Creates the cache directory if needed and indexes the files already in it."""
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+        self.memory_max_file_bytes = memory_max_file_bytes
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        return os.path.join(self.cache_dir, f"{key}.bin"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_index(self):
+        """Rebuilds the LRU order from the files on disk, using their modification time as last access."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".bin"):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def get(self, url: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Returns the cached ETag and content for a url, or None if it is not cached.
+
+        Args:
+            url (str): The server relative url of the file.
+        """
+        key = self._key(url)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                return self._memory[key]
+
+            if key not in self._disk:
+                return None
+
+            content_path, meta_path = self._paths(key)
+            try:
+                with open(meta_path, "r", encoding="utf-8") as meta_file:
+                    etag = json.load(meta_file)["etag"]
+                with open(content_path, "rb") as content_file:
+                    content = content_file.read()
+                os.utime(content_path)
+            except (OSError, ValueError, KeyError):
+                self._remove(key)
+                return None
+
+            self._disk.move_to_end(key)
+            self._remember(key, etag, content)
+            return etag, content
+
+    def put(self, url: str, etag: str, content: bytes):
+        """
+        Stores the content of a url with its ETag, evicting least recently used files if needed.
+
+        Args:
+            url (str): The server relative url of the file.
+            etag (str): The ETag SharePoint returned for the content.
+            content (bytes): The content of the file.
+        """
+        if len(content) > self.max_bytes:
+            return
+
+        key = self._key(url)
+        content_path, meta_path = self._paths(key)
+        with self._lock:
+            self._remove(key)
+            self._write_atomic(content_path, content)
+            self._write_atomic(meta_path, json.dumps({"url": url, "etag": etag}).encode("utf-8"))
+            self._disk[key] = len(content)
+            self._disk_bytes += len(content)
+            self._remember(key, etag, content)
+
+            while self._disk_bytes > self.max_bytes:
+                self._remove(next(iter(self._disk)))
+
+    def invalidate(self, url: str):
+        """Removes a url from the cache."""
+        with self._lock:
+            self._remove(self._key(url))
+
+    def _remember(self, key: str, etag: str, content: bytes):
+        """Keeps small files in the memory tier, evicting least recently used files if needed."""
+        if len(content) > self.memory_max_file_bytes:
+            return
+
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key)[1])
+        self._memory[key] = (etag, content)
+        self._memory_bytes += len(content)
+
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _remove(self, key: str):
+        """Drops a key from both tiers and deletes its files. Must be called with the lock held."""
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key)[1])
+        if key in self._disk:
+            self._disk_bytes -= self._disk.pop(key)
+        for path in self._paths(key):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _write_atomic(self, path: str, content: bytes):
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
@@ -31,26 +31,136 @@ Example:
 
 import os
 
-import math
+import json
+
+import tempfile
+
+import threading
+
+import time
 
 import traceback
 
-from pathlib import PurePath
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
-from io import BytesIO
+from dataclasses import dataclass, field
 
-from typing import Optional, List, Dict, Any, Union
+from pathlib import PurePath
+
+from typing import Optional, List, Dict, Any, Union, Callable, Tuple, Iterable, Iterator, BinaryIO
 
-from openpyxl.styles import Font, Alignment
 from openpyxl import load_workbook
 
 import pandas as pd
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from office365.runtime.http.http_method import HttpMethod
+from office365.runtime.http.request_options import RequestOptions
 from office365.sharepoint.client_context import ClientContext
 from office365.sharepoint.files.file import File
 
+from helpers.sharepoint_auth import get_certificate_credential
+from helpers.sharepoint_batch import SharepointBatch
+from helpers.sharepoint_cache import FileCache
+from helpers.sharepoint_log import SharepointLogSink
+from helpers.sharepoint_rest import RETRY_BASE_DELAY, THROTTLING_STATUS_CODES, odata_path
+from helpers.sharepoint_rows import Rows, RowValidationReport
+from helpers.sharepoint_workbook import (
+    ReportRows,
+    WorkbookSession,
+    ensure_row_list,
+    resolve_columns,
+    write_report_workbook,
+)
+
+# Size in bytes of the chunks streamed from SharePoint to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Files larger than this are uploaded in chunks of this size through an upload session
+UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+
+# Number of items requested per page when listing folders
+LIST_PAGE_SIZE = 500
+
+# Name of the manifest sync_folder keeps in the local destination folder
+SYNC_MANIFEST_NAME = ".sharepoint_sync.json"
+
+# sync_folder refuses to delete more than this fraction of the synced files in one run
+SYNC_MAX_DELETE_FRACTION = 0.5
+
+# Number of rows per DataFrame when streaming a worksheet
+EXCEL_CHUNK_ROWS = 10000
+
+
+def _retry_delay(response: requests.Response, attempt: int) -> float:
+    """Returns the delay before the next attempt, preferring the Retry-After header when present."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return RETRY_BASE_DELAY * (2 ** (attempt - 1))
+
+
+@dataclass
+class UploadSessionState:
+    """Progress of a chunked upload session, used to resume it after a failure"""
+
+    upload_id: str
+    file_url: str
+    offset: int = 0
+    completed: bool = False
+    attempts: int = 0
+    error: Optional[str] = None
+
 
-class Sharepoint:
+@dataclass
+class FileTransferResult:
+    """Outcome of transferring a single file to or from SharePoint"""
+
+    name: str
+    success: bool
+    bytes: int = 0
+    duration: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class TransferSummary:
+    """Per-file results and totals of a bulk transfer"""
+
+    results: List[FileTransferResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def succeeded(self) -> List[FileTransferResult]:
+        """Results of the files transferred successfully."""
+        return [res for res in self.results if res.success]
+
+    @property
+    def failed(self) -> List[FileTransferResult]:
+        """Results of the files that could not be transferred."""
+        return [res for res in self.results if not res.success]
+
+    @property
+    def total_bytes(self) -> int:
+        """Total number of bytes transferred."""
+        return sum(res.bytes for res in self.results)
+
+
+@dataclass
+class SyncResult:
+    """Outcome of an incremental folder sync"""
+
+    transfers: TransferSummary = field(default_factory=TransferSummary)
+    unchanged: int = 0
+    deleted: List[str] = field(default_factory=list)
+
+
+class Sharepoint:  # pylint: disable=too-many-public-methods
     """
     A class to interact with a SharePoint site, enabling authentication, file listing,
     downloading, uploading, and saving functionalities within a specified SharePoint document library.
@@ -61,6 +171,9 @@ class Sharepoint:
         site_url (str): URL of the SharePoint site.
         site_name (str): Name of the SharePoint site.
         document_library (str): Document library path.
+        site_title (Optional[str]): Title of the site, set once authentication succeeds.
+        auth_error (Optional[Exception]): The error raised during authentication, if any.
+        session (requests.Session): Pooled keep-alive HTTP session shared by all requests of the instance.
     """
 
     def __init__(
@@ -71,9 +184,21 @@ class Sharepoint:
             cert_path: str,
             site_url: str,
             site_name: str,
-            document_library: str
+            document_library: str,
+            lazy: bool = False,
+            probe_title: bool = True,
+            pool_size: int = 10,
+            file_cache: Optional[FileCache] = None
     ):
-        """Initializes the Sharepoint class with credentials and site details."""
+        """
+        Initializes the Sharepoint class with credentials and site details.
+
+        Args:
+            lazy (bool): If True, the client context is built on first use instead of during construction.
+            probe_title (bool): If True, authentication makes a round trip to read the site title.
+            pool_size (int): Maximum number of keep-alive connections kept in the HTTP session pool.
+            file_cache (Optional[FileCache]): Local cache used by fetch_file_content and fetch_file_using_open_binary.
+        """
         self.tenant = tenant
         self.client_id = client_id
         self.thumbprint = thumbprint
@@ -81,11 +206,63 @@ class Sharepoint:
         self.site_url = site_url
         self.site_name = site_name
         self.document_library = document_library
-        self.ctx = self._auth()
+        self.probe_title = probe_title
+        self.file_cache = file_cache
+        self.site_title: Optional[str] = None
+        self.auth_error: Optional[Exception] = None
+        self.session = self._create_session(pool_size)
+        self._ctx: Optional[ClientContext] = None
+        self._ctx_lock = threading.Lock()
+        self._auth_attempted = False
+        if not lazy:
+            self._connect()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def close(self):
+        """Closes the pooled HTTP session."""
+        self.session.close()
+
+    @property
+    def ctx(self) -> Optional[ClientContext]:
+        """The client context, authenticated on first access."""
+        if not self._auth_attempted:
+            self._connect()
+        return self._ctx
+
+    def _connect(self):
+        """Builds the client context once, also when several threads ask for it at the same time."""
+        with self._ctx_lock:
+            if not self._auth_attempted:
+                self._ctx = self._auth()
+                self._auth_attempted = True
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        """
+        Creates a keep-alive HTTP session with a connection pool of the given size.
+
+        Args:
+            pool_size (int): Maximum number of connections kept open per host.
+
+        Returns:
+            requests.Session: The pooled session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def _auth(self):
         """
         Authenticates to the SharePoint site and returns the client context.
+        Tokens come from the process-wide certificate credential, so they are shared across instances.
+        The site title is only fetched when probe_title is set, otherwise no request is made.
 
         Returns:
             Optional[ClientContext]: A ClientContext object for interacting with the SharePoint site if authentication is successful,
@@ -93,21 +270,42 @@ class Sharepoint:
         """
         try:
             site_full_url = f"{self.site_url}/teams/{self.site_name}"
-            ctx = ClientContext(site_full_url).with_client_certificate(
+            credential = get_certificate_credential(
                 tenant=self.tenant,
                 client_id=self.client_id,
                 thumbprint=self.thumbprint,
                 cert_path=self.cert_path
             )
-            web = ctx.web
-            ctx.load(web)
-            ctx.execute_query()
-            print(f"Authenticated successfully. Site Title: {web.properties['Title']}")
+            ctx = (
+                ClientContext(site_full_url)
+                .with_access_token(credential.token_provider(site_full_url))
+                .with_transport(session=self.session)
+            )
+            if self.probe_title:
+                web = ctx.web
+                ctx.load(web)
+                ctx.execute_query()
+                self.site_title = web.properties['Title']
+                print(f"Authenticated successfully. Site Title: {self.site_title}")
             return ctx
         except Exception as e:
+            self.auth_error = e
             print(f"Failed to authenticate: {e}")
             return None
 
+    def batch(self, batch_size: int = 100, max_retries: int = 3) -> SharepointBatch:
+        """
+        Returns a batch that queues operations and sends them as $batch requests when its with block exits.
+
+        Args:
+            batch_size (int): Maximum number of operations sent per $batch request.
+            max_retries (int): Retries for operations throttled with HTTP 429/503.
+
+        Returns:
+            SharepointBatch: The batch to queue operations on.
+        """
+        return SharepointBatch(self, batch_size, max_retries)
+
     def fetch_files_list(self, folder_name: str) -> Optional[List[dict]]:
         """
         Retrieves a list of files from a specified folder within the document library.
@@ -132,6 +330,131 @@ class Sharepoint:
                 return None
         return None
 
+    def get_json(self, url: str, max_retries: int = 3) -> Dict[str, Any]:
+        """Sends a GET request for a REST url with throttling-aware retries and returns the JSON body."""
+        request = RequestOptions(url, headers={"Accept": "application/json;odata=nometadata"})
+        response, _ = self.send_with_retry(lambda: self.ctx.pending_request().execute_request_direct(request), max_retries)
+        return response.json()
+
+    def _list_folder_page(
+        self, kind: str, url: str, page_size: int, skip: int = 0
+    ) -> Tuple[str, List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        """
+        Fetches one page of the files or subfolders of a folder.
+
+        Returns:
+            Tuple[str, List[Dict[str, Any]], Optional[Tuple[str, int]]]: The kind, the items on the page and the url
+                and $skip offset of the next page, if there may be one.
+        """
+        page = self.get_json(f"{url}&$skip={skip}" if skip else url)
+        items = page.get("value", [])
+        next_link = page.get("odata.nextLink") or page.get("@odata.nextLink")
+        if next_link:
+            return kind, items, (next_link, 0)
+
+        # Some endpoints, the folder /Files collection among them, return a full page without a next link.
+        # A full page may then be followed by more, so page on with $skip, as the office365 client does.
+        if len(items) >= page_size:
+            return kind, items, (url, skip + len(items))
+
+        return kind, items, None
+
+    def iter_files(
+        self,
+        folder_name: str,
+        recursive: bool = False,
+        page_size: int = LIST_PAGE_SIZE,
+        max_workers: int = 4,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lists the files in a folder page by page, yielding each file as soon as its page arrives.
+        With recursive set, subfolders are expanded concurrently while files are being yielded,
+        so callers can start processing files before the listing is complete.
+
+        Args:
+            folder_name (str): The name of the folder within the document library.
+            recursive (bool): If True, files in all subfolders are listed as well.
+            page_size (int): Number of items requested per page.
+            max_workers (int): Maximum number of pages fetched at the same time.
+
+        Yields:
+            Dict[str, Any]: File metadata with Name, ServerRelativeUrl, Length (int), TimeLastModified and ETag.
+        """
+        if not self.ctx:
+            return
+
+        def _files_url(folder_url: str) -> str:
+            return (
+                f"{self.ctx.service_root_url}/web/getFolderByServerRelativePath(DecodedUrl='{odata_path(folder_url)}')/Files"
+                f"?$select=Name,ServerRelativeUrl,Length,TimeLastModified,ETag&$top={page_size}"
+            )
+
+        def _folders_url(folder_url: str) -> str:
+            return (
+                f"{self.ctx.service_root_url}/web/getFolderByServerRelativePath(DecodedUrl='{odata_path(folder_url)}')/Folders"
+                f"?$select=Name,ServerRelativeUrl&$top={page_size}"
+            )
+
+        root_url = f"/teams/{self.site_name}/{self.document_library}/{folder_name}".rstrip("/")
+        forms_url = f"/teams/{self.site_name}/{self.document_library}/Forms"
+        pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        try:
+            pending = {pool.submit(self._list_folder_page, "files", _files_url(root_url), page_size)}
+            if recursive:
+                pending.add(pool.submit(self._list_folder_page, "folders", _folders_url(root_url), page_size))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, items, next_page = future.result()
+                    if next_page:
+                        next_url, skip = next_page
+                        pending.add(pool.submit(self._list_folder_page, kind, next_url, page_size, skip))
+
+                    if kind == "folders":
+                        # The Forms folder at the library root holds the library's views, not documents
+                        subfolders = [folder["ServerRelativeUrl"] for folder in items if folder["ServerRelativeUrl"] != forms_url]
+                        pending.update(pool.submit(self._list_folder_page, "files", _files_url(url), page_size) for url in subfolders)
+                        pending.update(pool.submit(self._list_folder_page, "folders", _folders_url(url), page_size) for url in subfolders)
+                        continue
+
+                    for file in items:
+                        file["Length"] = int(file.get("Length") or 0)
+                        yield file
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_file(self, file_url: str, max_retries: int = 3) -> Tuple[bytes, Optional[str]]:
+        """
+        Returns the content and ETag of a file, through the file cache if one is set. A cached copy is validated
+        with a conditional request (If-None-Match), so an unchanged file costs one cheap round trip instead of a
+        full download.
+
+        Args:
+            file_url (str): The server relative url of the file.
+            max_retries (int): Retries on throttling (HTTP 429/503) or connection errors.
+
+        Returns:
+            Tuple[bytes, Optional[str]]: The content of the file and its ETag.
+
+        Raises:
+            requests.RequestException: If the file cannot be fetched, e.g. with status 404 if it does not exist.
+        """
+        cached = self.file_cache.get(file_url) if self.file_cache else None
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response, _ = self.send_with_retry(lambda: self.open_file_stream(file_url, headers), max_retries)
+
+        with response:
+            if cached and response.status_code == 304:
+                return cached[1], cached[0]
+
+            content = response.content
+
+        etag = response.headers.get("ETag")
+        if etag and self.file_cache:
+            self.file_cache.put(file_url, etag, content)
+        return content, etag
+
     def fetch_file_content(self, file_name: str, folder_name: str) -> Optional[bytes]:
         """
         Downloads a file from a specified folder within the document library.
@@ -146,6 +469,8 @@ class Sharepoint:
         if self.ctx:
             try:
                 file_url = f"/teams/{self.site_name}/{self.document_library}/{folder_name}/{file_name}"
+                if self.file_cache:
+                    return self.fetch_file(file_url)[0]
                 file = self.ctx.web.get_file_by_server_relative_url(file_url)
                 file_content = file.read().execute_query()
                 return file_content.value
@@ -161,6 +486,8 @@ class Sharepoint:
         if self.ctx:
             try:
                 file_url = f"/teams/{self.site_name}/{self.document_library}/{folder_name}/{file_name}"
+                if self.file_cache:
+                    return self.fetch_file(file_url)[0]
                 file_content = File.open_binary(self.ctx, file_url)
                 return file_content.content
             except Exception:
@@ -182,43 +509,314 @@ class Sharepoint:
         with open(file_directory_path, "wb") as file:
             file.write(file_content)
 
+    def _write_stream(self, folder_destination: str, file_name: str, chunks: Iterable[bytes]) -> int:
+        """
+        Writes chunks to a temporary file next to the destination and atomically renames it into place,
+        so a failed or partial download never leaves a truncated file behind.
+
+        Args:
+            folder_destination (str): The local folder path where the file will be saved.
+            file_name (str): The name of the file to be saved.
+            chunks (Iterable[bytes]): The content of the file in chunks.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        bytes_written = 0
+        fd, temp_path = tempfile.mkstemp(prefix=f".{file_name}.", suffix=".part", dir=folder_destination)
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                for chunk in chunks:
+                    temp_file.write(chunk)
+                    bytes_written += len(chunk)
+            os.replace(temp_path, PurePath(folder_destination, file_name))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return bytes_written
+
+    def file_endpoint(self, file_url: str) -> str:
+        """Returns the REST endpoint of a file, given its server relative url."""
+        return f"{self.ctx.service_root_url}/web/getFileByServerRelativePath(DecodedUrl='{odata_path(file_url)}')"
+
+    def open_file_stream(self, file_url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Opens the content of a file as a streamed response, so the body is only read when iterated.
+
+        Args:
+            file_url (str): The server relative url of the file.
+            headers (Optional[Dict[str, str]]): Additional request headers.
+
+        Returns:
+            requests.Response: The open, streamed response.
+        """
+        request = RequestOptions(
+            f"{self.file_endpoint(file_url)}/$value",
+            headers=dict(headers or {}),
+            stream=True,
+        )
+        return self.ctx.pending_request().execute_request_direct(request)
+
+    def download_file_stream(
+        self,
+        folder: str,
+        filename: str,
+        destination: Union[str, BinaryIO],
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_retries: int = 3,
+    ) -> int:
+        """
+        Downloads a file in fixed-size chunks, so memory use stays bounded regardless of the file size.
+
+        Args:
+            folder (str): The name of the folder in the document library containing the file.
+            filename (str): The name of the file to download.
+            destination (Union[str, BinaryIO]): A local folder path, where the file is written to a temporary
+                file and renamed into place when complete, or a binary file object to write the chunks to.
+            chunk_size (int): Number of bytes read from the response and written at a time.
+            max_retries (int): Retries on throttling (HTTP 429/503) or connection errors before the transfer starts.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        file_url = f"/teams/{self.site_name}/{self.document_library}/{folder}/{filename}"
+        response, _ = self.send_with_retry(lambda: self.open_file_stream(file_url), max_retries)
+
+        with response:
+            chunks = response.iter_content(chunk_size=chunk_size)
+            if isinstance(destination, str):
+                return self._write_stream(destination, filename, chunks)
+
+            bytes_written = 0
+            for chunk in chunks:
+                destination.write(chunk)
+                bytes_written += len(chunk)
+            return bytes_written
+
     def download_file(self, folder: str, filename: str, folder_destination: str):
         """
         Downloads a specified file from a specified folder and saves it to a local destination.
+        The file is streamed to disk in chunks instead of being held in memory.
 
         Args:
             folder (str): The name of the folder in the document library containing the file.
             filename (str): The name of the file to download.
             folder_destination (str): The local folder path where the downloaded file will be saved.
         """
-        file_content = self.fetch_file_content(filename, folder)
-        if file_content:
-            self._write_file(folder_destination, filename, file_content)
+        if self.ctx:
+            try:
+                self.download_file_stream(folder, filename, folder_destination)
+            except Exception as e:
+                print(f"Failed to download {filename}: {e}")
         else:
             print(f"Failed to download {filename}")
 
-    def download_files(self, folder: str, folder_destination: str):
+    def send_with_retry(self, send: Callable[[], Any], max_retries: int) -> Tuple[Any, int]:
         """
-        Downloads all files from a specified folder and saves them to a local destination.
+        Sends a request, retrying on throttling (HTTP 429/503) and connection errors with backoff.
+        A Retry-After header from SharePoint takes precedence over the exponential backoff.
+
+        Args:
+            send (Callable[[], Any]): Function performing a single request, returning a response or a query result.
+            max_retries (int): Number of retries after the first attempt.
+
+        Returns:
+            Tuple[Any, int]: The result of send and the number of attempts used.
+
+        Raises:
+            requests.RequestException: If the error is not retried, or retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = send()
+                if isinstance(result, requests.Response):
+                    result.raise_for_status()
+                return result, attempt
+            except requests.RequestException as e:
+                response = e.response
+                if attempt > max_retries:
+                    raise
+                if response is None:
+                    time.sleep(RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+                elif response.status_code in THROTTLING_STATUS_CODES:
+                    time.sleep(_retry_delay(response, attempt))
+                else:
+                    raise
+
+    def _download_to_folder(self, folder: str, file_name: str, folder_destination: str, max_retries: int) -> FileTransferResult:
+        """
+        Downloads a single file with throttling-aware retries and writes it to the local destination.
+
+        Returns:
+            FileTransferResult: The outcome of the download.
+        """
+        start = time.perf_counter()
+        attempts = 0
+        file_url = f"/teams/{self.site_name}/{self.document_library}/{folder}/{file_name}"
+
+        def _send():
+            nonlocal attempts
+            attempts += 1
+            return self.open_file_stream(file_url)
+
+        try:
+            response, _ = self.send_with_retry(_send, max_retries)
+            with response:
+                bytes_written = self._write_stream(
+                    folder_destination, file_name, response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+                )
+            return FileTransferResult(file_name, True, bytes_written, time.perf_counter() - start, attempts)
+        except Exception as e:
+            return FileTransferResult(file_name, False, 0, time.perf_counter() - start, attempts, str(e))
+
+    def download_files(
+        self,
+        folder: str,
+        folder_destination: str,
+        max_workers: int = 8,
+        max_retries: int = 3,
+        progress: Optional[Callable[[int, int, FileTransferResult], None]] = None,
+    ) -> TransferSummary:
+        """
+        Downloads all files from a specified folder in parallel and saves them to a local destination.
+        Each worker streams its file to disk as it arrives, so network transfers and disk writes overlap.
 
         Args:
             folder (str): The name of the folder in the document library containing the files.
             folder_destination (str): The local folder path where the downloaded files will be saved.
+            max_workers (int): Maximum number of files downloaded at the same time.
+            max_retries (int): Retries per file on throttling (HTTP 429/503) or connection errors.
+            progress (Optional[Callable[[int, int, FileTransferResult], None]]): Called with
+                (completed, total, result) after each file finishes.
+
+        Returns:
+            TransferSummary: Per-file results and totals for the download.
         """
-        files_list = self.fetch_files_list(folder)
+        start = time.perf_counter()
+        files_list = self.fetch_files_list(folder) or []
+        results: List[FileTransferResult] = []
+
         if files_list:
-            for file in files_list:
-                file_content = self.fetch_file_content(file["Name"], folder)
-                if file_content:
-                    self._write_file(folder_destination, file["Name"], file_content)
-                else:
-                    print(f"Failed to download {file['Name']}")
-        else:
-            print(f"No files found in folder {folder}")
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(files_list)))) as pool:
+                futures = [
+                    pool.submit(self._download_to_folder, folder, file["Name"], folder_destination, max_retries)
+                    for file in files_list
+                ]
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    if progress:
+                        progress(len(results), len(files_list), results[-1])
+
+        return TransferSummary(results, time.perf_counter() - start)
+
+    def sync_folder(
+        self,
+        folder: str,
+        folder_destination: str,
+        recursive: bool = False,
+        delete_removed: bool = False,
+        max_workers: int = 8,
+        max_retries: int = 3,
+        max_delete_fraction: float = SYNC_MAX_DELETE_FRACTION,
+    ) -> SyncResult:
+        """
+        Incrementally syncs a folder to a local destination, downloading only files that were added or changed
+        since the last run. A manifest with the ETag, modified time and size of each synced file is kept in
+        the destination folder. Downloads start while the folder listing is still in progress.
+
+        Args:
+            folder (str): The name of the folder in the document library to sync.
+            folder_destination (str): The local folder path the files are synced to.
+            recursive (bool): If True, subfolders are synced as well, mirroring the folder structure locally.
+            delete_removed (bool): If True, local files that no longer exist in SharePoint are deleted. Nothing is
+                deleted if the listing failed part way, or if more than max_delete_fraction of the synced files
+                would be deleted.
+            max_workers (int): Maximum number of files downloaded at the same time.
+            max_retries (int): Retries per file on throttling (HTTP 429/503) or connection errors.
+            max_delete_fraction (float): The largest fraction of the synced files delete_removed may delete in one run.
+
+        Returns:
+            SyncResult: The downloaded files, the number of unchanged files and the deleted local files.
+        """
+        start = time.perf_counter()
+        result = SyncResult()
+        manifest_path = os.path.join(folder_destination, SYNC_MANIFEST_NAME)
+        manifest: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+
+        if not self.ctx:
+            return result
+
+        root_url = f"/teams/{self.site_name}/{self.document_library}/{folder}".rstrip("/")
+        remote_paths = set()
+        futures = {}
+        listing_complete = False
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            try:
+                for file in self.iter_files(folder, recursive=recursive):
+                    relative_path = file["ServerRelativeUrl"][len(root_url) + 1:]
+                    remote_paths.add(relative_path)
+                    entry = {"ETag": file.get("ETag"), "TimeLastModified": file.get("TimeLastModified"), "Length": file["Length"]}
+                    local_path = os.path.join(folder_destination, *relative_path.split("/"))
+
+                    if manifest.get(relative_path) == entry and os.path.exists(local_path):
+                        result.unchanged += 1
+                        continue
+
+                    relative_dir, _, file_name = relative_path.rpartition("/")
+                    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                    future = pool.submit(
+                        self._download_to_folder,
+                        f"{folder}/{relative_dir}" if relative_dir else folder,
+                        file_name,
+                        os.path.dirname(local_path),
+                        max_retries,
+                    )
+                    futures[future] = (relative_path, entry)
+                listing_complete = True
+            except Exception as e:
+                # A partial listing says nothing about which files were removed, so nothing is deleted below
+                print(f"Failed to list '{folder}', syncing the files listed so far and deleting nothing: {e}")
+
+            for future in as_completed(futures):
+                relative_path, entry = futures[future]
+                transfer = future.result()
+                transfer.name = relative_path
+                result.transfers.results.append(transfer)
+                if transfer.success:
+                    manifest[relative_path] = entry
+
+        if delete_removed and listing_complete:
+            in_scope = {path for path in manifest if recursive or "/" not in path}
+            removed = sorted(in_scope - remote_paths)
+            if in_scope and len(removed) > max_delete_fraction * len(in_scope):
+                print(
+                    f"Not deleting {len(removed)} of {len(in_scope)} synced files removed from '{folder}', "
+                    f"more than the allowed fraction of {max_delete_fraction}. Delete them manually if intended."
+                )
+                removed = []
+
+            for relative_path in removed:
+                local_path = os.path.join(folder_destination, *relative_path.split("/"))
+                if os.path.exists(local_path):
+                    os.remove(local_path)
+                del manifest[relative_path]
+                result.deleted.append(relative_path)
+
+        self._write_stream(folder_destination, SYNC_MANIFEST_NAME, [json.dumps(manifest, indent=2).encode("utf-8")])
+        result.transfers.duration = time.perf_counter() - start
+        return result
 
     def upload_file(self, folder_name: str, file_path: str, file_name: Optional[str] = None):
         """
         Uploads a single file to a specified folder within the document library.
+        Files larger than UPLOAD_CHUNK_SIZE are uploaded in chunks through an upload session.
 
         Args:
             folder_name (str): The name of the folder within the document library.
@@ -230,6 +828,10 @@ class Sharepoint:
                 if file_name is None:
                     file_name = os.path.basename(file_path)
 
+                if os.path.getsize(file_path) > UPLOAD_CHUNK_SIZE:
+                    self.upload_file_chunked(folder_name, file_path, file_name)
+                    return
+
                 folder_url = f"/teams/{self.site_name}/{self.document_library}/{folder_name}"
                 target_folder = self.ctx.web.get_folder_by_server_relative_url(folder_url)
 
@@ -241,21 +843,214 @@ class Sharepoint:
             except Exception as e:
                 print(f"Failed to upload file '{file_name}': {e}")
 
-    def upload_files(self, folder_name: str, files: List[str]):
+    def upload_file_chunked(
+        self,
+        folder_name: str,
+        file_path: str,
+        file_name: Optional[str] = None,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_retries: int = 3,
+        resume_state: Optional[UploadSessionState] = None,
+    ) -> Optional[UploadSessionState]:
         """
-        Uploads multiple files to a specified folder within the document library.
+        Uploads a file in chunks using a SharePoint upload session (StartUpload, ContinueUpload, FinishUpload).
+        The file is streamed from disk one chunk at a time, and a failed chunk is retried from the last offset
+        confirmed by SharePoint.
+
+        Args:
+            folder_name (str): The name of the folder within the document library.
+            file_path (str): The local path to the file to be uploaded.
+            file_name (Optional[str]): The name to give the file in SharePoint. If not provided, uses the name from file_path.
+            chunk_size (int): Number of bytes sent per request.
+            max_retries (int): Retries per chunk on throttling (HTTP 429/503) or connection errors.
+            resume_state (Optional[UploadSessionState]): State returned by an earlier, unfinished call. When given,
+                the upload continues from its confirmed offset instead of starting over.
+
+        Returns:
+            Optional[UploadSessionState]: The state of the upload session, with completed set once the file is committed,
+                                          or None if the site is not authenticated.
+        """
+        if not self.ctx:
+            return None
+
+        folder_url = f"/teams/{self.site_name}/{self.document_library}/{folder_name}"
+        return self._upload_chunked_to_folder(folder_url, file_path, file_name, chunk_size, max_retries, resume_state)
+
+    def _upload_chunked_to_folder(
+        self,
+        folder_url: str,
+        file_path: str,
+        file_name: Optional[str] = None,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_retries: int = 3,
+        resume_state: Optional[UploadSessionState] = None,
+    ) -> UploadSessionState:
+        """
+        Uploads a file in chunks to an already resolved folder. See upload_file_chunked for the parameters.
+        Every request sent, retries included, is counted in the state's attempts, and a failure is kept in its error.
+        """
+        if file_name is None:
+            file_name = os.path.basename(file_path)
+
+        state = resume_state or UploadSessionState(str(uuid.uuid4()), f"{folder_url}/{file_name}")
+        state.error = None
+
+        def _send(query: Callable[[], Any]) -> Any:
+            def _counted():
+                state.attempts += 1
+                return query()
+
+            result, _ = self.send_with_retry(_counted, max_retries)
+            return result
+
+        try:
+            file_size = os.path.getsize(file_path)
+
+            if state.offset == 0:
+                target_folder = self.ctx.web.get_folder_by_server_relative_url(folder_url)
+
+                # FinishUpload needs a session opened by StartUpload, so a file that fits in one chunk is sent in a single request
+                if file_size <= chunk_size:
+                    with open(file_path, "rb") as content_file:
+                        content = content_file.read()
+                    _send(lambda: target_folder.files.add(file_name, content, True).execute_query())
+                    state.offset = file_size
+                    state.completed = True
+                    print(f"File '{file_name}' uploaded successfully to '{folder_url}'.")
+                    return state
+
+                _send(lambda: target_folder.files.add(file_name, None, True).execute_query())
+
+            target_file = self.ctx.web.get_file_by_server_relative_url(state.file_url)
+
+            with open(file_path, "rb") as content_file:
+                while not state.completed:
+                    content_file.seek(state.offset)
+                    content = content_file.read(chunk_size)
+
+                    if state.offset + len(content) >= file_size:
+                        _send(lambda: target_file.finish_upload(state.upload_id, state.offset, content).execute_query())
+                        state.offset = file_size
+                        state.completed = True
+                    elif state.offset == 0:
+                        result = _send(lambda: target_file.start_upload(state.upload_id, content).execute_query())
+                        state.offset = int(result.value)
+                    else:
+                        result = _send(
+                            lambda: target_file.continue_upload(state.upload_id, state.offset, content).execute_query()
+                        )
+                        state.offset = int(result.value)
+
+            print(f"File '{file_name}' uploaded successfully to '{folder_url}'.")
+        except Exception as e:
+            state.error = str(e)
+            print(f"Failed to upload file '{file_name}' at offset {state.offset}: {e}")
+
+        return state
+
+    def _upload_to_folder(self, folder_url: str, file_path: str, max_retries: int) -> FileTransferResult:
+        """
+        Uploads a single file to an already resolved folder with throttling-aware retries.
+        The request is sent directly, so several uploads can run on the same client context at once.
+
+        Returns:
+            FileTransferResult: The outcome of the upload.
+        """
+        start = time.perf_counter()
+        attempts = 0
+        file_name = os.path.basename(file_path)
+        url = (
+            f"{self.ctx.service_root_url}/web/getFolderByServerRelativePath(DecodedUrl='{odata_path(folder_url)}')"
+            f"/Files/AddUsingPath(DecodedUrl='{odata_path(file_name)}',Overwrite=true)"
+        )
+
+        def _send():
+            nonlocal attempts
+            attempts += 1
+            with open(file_path, "rb") as content_file:
+                request = RequestOptions(url, method=HttpMethod.Post, data=content_file)
+                return self.ctx.pending_request().execute_request_direct(request)
+
+        try:
+            self.send_with_retry(_send, max_retries)
+            return FileTransferResult(file_name, True, os.path.getsize(file_path), time.perf_counter() - start, attempts)
+        except Exception as e:
+            return FileTransferResult(file_name, False, 0, time.perf_counter() - start, attempts, str(e))
+
+    def upload_files(
+        self,
+        folder_name: str,
+        files: List[str],
+        max_workers: int = 8,
+        max_retries: int = 3,
+        progress: Optional[Callable[[int, int, FileTransferResult], None]] = None,
+    ) -> TransferSummary:
+        """
+        Uploads multiple files to a specified folder within the document library in parallel.
+        The target folder is resolved once and used for every file. Files larger than UPLOAD_CHUNK_SIZE
+        are uploaded in chunks one at a time, after the parallel uploads have finished: the upload
+        session requests go through the client context's query queue, which cannot be shared between threads.
 
         Args:
             folder_name (str): The name of the folder within the document library.
             files (List[str]): A list of local file paths to be uploaded.
+            max_workers (int): Maximum number of files uploaded at the same time.
+            max_retries (int): Retries per file on throttling (HTTP 429/503) or connection errors.
+            progress (Optional[Callable[[int, int, FileTransferResult], None]]): Called with
+                (completed, total, result) after each file finishes.
+
+        Returns:
+            TransferSummary: Per-file results and totals for the upload.
         """
-        if self.ctx:
+        start = time.perf_counter()
+        results: List[FileTransferResult] = []
+
+        def _record(result: FileTransferResult):
+            results.append(result)
+            if progress:
+                progress(len(results), len(files), result)
+
+        if not self.ctx or not files:
+            return TransferSummary(results, time.perf_counter() - start)
+
+        folder_url = f"/teams/{self.site_name}/{self.document_library}/{folder_name}"
+        try:
+            folder = self.ctx.web.get_folder_by_server_relative_url(folder_url).get().execute_query()
+            folder_url = folder.server_relative_url or folder_url
+        except Exception as e:
             for file_path in files:
-                try:
-                    file_name = os.path.basename(file_path)
-                    self.upload_file(folder_name, file_path, file_name)
-                except Exception as e:
-                    print(f"Failed to upload file '{file_path}': {e}")
+                _record(FileTransferResult(os.path.basename(file_path), False, error=f"Folder '{folder_url}' not available: {e}"))
+            return TransferSummary(results, time.perf_counter() - start)
+
+        small_files: List[str] = []
+        large_files: List[str] = []
+        for file_path in files:
+            if not os.path.isfile(file_path):
+                _record(FileTransferResult(os.path.basename(file_path), False, error=f"File '{file_path}' not found"))
+            elif os.path.getsize(file_path) > UPLOAD_CHUNK_SIZE:
+                large_files.append(file_path)
+            else:
+                small_files.append(file_path)
+
+        if small_files:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(small_files)))) as pool:
+                futures = [pool.submit(self._upload_to_folder, folder_url, file_path, max_retries) for file_path in small_files]
+                for future in as_completed(futures):
+                    _record(future.result())
+
+        for file_path in large_files:
+            file_start = time.perf_counter()
+            state = self._upload_chunked_to_folder(folder_url, file_path, max_retries=max_retries)
+            _record(FileTransferResult(
+                os.path.basename(file_path),
+                state.completed,
+                state.offset,
+                time.perf_counter() - file_start,
+                state.attempts,
+                error=None if state.completed else state.error or "Chunked upload did not complete",
+            ))
+
+        return TransferSummary(results, time.perf_counter() - start)
 
     def upload_file_from_bytes(self, binary_content: bytes, file_name: str, folder_name: str):
         """
@@ -277,6 +1072,118 @@ class Sharepoint:
             except Exception as e:
                 print(f"Failed to upload file '{file_name}': {e}")
 
+    def upload_local_file(self, folder_name: str, file_path: str, max_retries: int = 3) -> Optional[FileTransferResult]:
+        """
+        Uploads a local file from disk without reading it into memory, through an upload session when it is
+        larger than UPLOAD_CHUNK_SIZE and as a single streamed request otherwise.
+
+        Args:
+            folder_name (str): The folder in the document library where the file will be uploaded.
+            file_path (str): The local path to the file. The file keeps its name in SharePoint.
+            max_retries (int): Retries on throttling (HTTP 429/503) or connection errors.
+
+        Returns:
+            Optional[FileTransferResult]: The outcome of the upload, or None if the site is not authenticated.
+        """
+        if not self.ctx:
+            return None
+
+        start = time.perf_counter()
+        file_name = os.path.basename(file_path)
+        file_size = os.path.getsize(file_path)
+
+        if file_size <= UPLOAD_CHUNK_SIZE:
+            folder_url = f"/teams/{self.site_name}/{self.document_library}/{folder_name}"
+            return self._upload_to_folder(folder_url, file_path, max_retries)
+
+        state = self.upload_file_chunked(folder_name, file_path, file_name, max_retries=max_retries)
+        result = FileTransferResult(file_name, state.completed, state.offset, time.perf_counter() - start)
+        if not state.completed:
+            result.error = f"Upload stopped at offset {state.offset} of {file_size}"
+        return result
+
+    def upload_report(
+        self,
+        folder_name: str,
+        file_name: str,
+        rows: ReportRows,
+        headers: Optional[List[str]] = None,
+        sheet_name: str = "Sheet1",
+        column_widths: Any = "auto",
+        freeze_panes: Optional[str] = "A2",
+        max_retries: int = 3,
+    ) -> Optional[FileTransferResult]:
+        """
+        Writes rows to a new Excel report and uploads it, without holding the workbook in memory.
+        The rows are streamed into a write-only workbook spooled to a temporary file, which is then uploaded
+        from disk, in chunks through an upload session when it is larger than UPLOAD_CHUNK_SIZE.
+
+        Args:
+            folder_name (str): The folder in the document library where the report will be uploaded.
+            file_name (str): The name to give the report in SharePoint. An existing file is overwritten.
+            rows (ReportRows): A DataFrame, an iterable of DataFrame chunks, or an iterable of dicts or sequences.
+            headers (Optional[List[str]]): The columns to write. Defaults to the DataFrame columns or the keys of the
+                first dict, and is required for rows given as sequences.
+            sheet_name (str): Name of the sheet.
+            column_widths (Any): "auto", an int for all columns, a dict of header -> width, or None.
+            freeze_panes (Optional[str]): E.g., "A2" to freeze the header row.
+            max_retries (int): Retries on throttling (HTTP 429/503) or connection errors.
+
+        Returns:
+            Optional[FileTransferResult]: The outcome of the upload, or None if the site is not authenticated.
+        """
+        if not self.ctx:
+            return None
+
+        start = time.perf_counter()
+        folder_url = f"/teams/{self.site_name}/{self.document_library}/{folder_name}"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, file_name)
+            try:
+                row_count = write_report_workbook(file_path, rows, headers, sheet_name, column_widths, freeze_panes)
+            except Exception as e:
+                print(f"Failed to write report '{file_name}': {e}")
+                return FileTransferResult(file_name, False, 0, time.perf_counter() - start, 0, str(e))
+
+            result = self.upload_local_file(folder_name, file_path, max_retries)
+            result.duration = time.perf_counter() - start
+
+        if result.success:
+            print(f"Report '{file_name}' with {row_count} rows uploaded successfully to '{folder_url}'.")
+        else:
+            print(f"Failed to upload report '{file_name}': {result.error}")
+
+        return result
+
+    def log_sink(self, folder_name: str, **options) -> SharepointLogSink:
+        """
+        Creates an append-only log sink that writes buffered rows as segment files into a folder.
+        Use it instead of append_row_to_sharepoint_excel for frequent, small appends.
+
+        Args:
+            folder_name (str): The folder in the document library holding the segments.
+            **options: Keyword arguments passed on to SharepointLogSink (headers, segment_format, flush_rows,
+                flush_interval, compact_to, compact_interval, ...).
+
+        Returns:
+            SharepointLogSink: The sink, to be used as a context manager or closed explicitly.
+        """
+        return SharepointLogSink(self, folder_name, **options)
+
+    def open_workbook(self, folder_name: str, excel_file_name: str) -> WorkbookSession:
+        """
+        Opens a workbook session that fetches and parses the workbook once and uploads it once on exit.
+
+        Args:
+            folder_name (str): Name of the folder where the file resides.
+            excel_file_name (str): Name of the excel file.
+
+        Returns:
+            WorkbookSession: The session, to be used as a context manager.
+        """
+        return WorkbookSession(self, folder_name, excel_file_name)
+
     def append_row_to_sharepoint_excel(
         self,
         required_headers: Optional[List[str]] = None,
@@ -291,56 +1198,55 @@ class Sharepoint:
         """
 
         # Ensure new_rows is a list of dicts
-        if isinstance(new_rows, dict):
-            new_rows = [new_rows]
-
-        elif not isinstance(new_rows, list) or not all(isinstance(r, dict) for r in new_rows):
-            raise TypeError("new_rows must be a dict or a list of dicts.")
-
-        # 1. Pull file
-        binary_file = self.fetch_file_using_open_binary(excel_file_name, folder_name)
-        if binary_file is None:
-            raise FileNotFoundError(f"File '{excel_file_name}' not found in folder '{folder_name}'.")
+        new_rows = ensure_row_list(new_rows)
 
-        wb = load_workbook(BytesIO(binary_file))
-
-        if sheet_name not in wb.sheetnames:
-            raise ValueError(f"Sheet '{sheet_name}' not found in '{excel_file_name}'")
-
-        ws = wb[sheet_name]
-
-        # 2. Validate headers
-        if required_headers:
-            current_headers = [cell.value for cell in ws[1]]
-
-            if current_headers != required_headers:
-                raise ValueError(
-                    f"Header mismatch in sheet '{sheet_name}'!\n"
-                    f"Expected: {required_headers}\n"
-                    f"Found:    {current_headers}"
-                )
+        # 1. Pull file, 2. validate headers, 3. append rows, 4. save and upload
+        with self.open_workbook(folder_name, excel_file_name) as session:
+            session.append_rows(sheet_name, new_rows, required_headers)
 
-        # 2.5 Clean up empty rows before appending
-        for row_idx in range(ws.max_row, 1, -1):  # Start from bottom, skip header
-            row_values = [cell.value for cell in ws[row_idx]]
-
-            if all(cell is None for cell in row_values):
-                ws.delete_rows(row_idx)
-
-        # 3. Append each new row
-        headers = [header.value for header in ws[1]]
-
-        for row_dict in new_rows:
-            ws.append([row_dict.get(header, "") for header in headers])
+    def append_batch_to_sharepoint_excel(
+        self,
+        folder_name: str,
+        excel_file_name: str,
+        sheet_name: str,
+        rows: Rows,
+        column_types: Optional[Dict[str, str]] = None,
+        required_columns: Optional[List[str]] = None,
+        required_headers: Optional[List[str]] = None,
+        on_error: str = "quarantine",
+        quarantine_sheet: Optional[str] = None,
+    ) -> RowValidationReport:
+        """
+        Appends a batch of rows to an existing Excel file, after mapping, validating and coercing them column-wise.
+        The workbook is downloaded and uploaded once for the whole batch.
 
-        # 4. Save and upload
-        temp_stream = BytesIO()
+        Args:
+            folder_name (str): Name of the folder where the file resides.
+            excel_file_name (str): Name of the excel file.
+            sheet_name (str): Name of the sheet to append to.
+            rows (Rows): A DataFrame, a dict or a list of dicts keyed by header.
+            column_types (Optional[Dict[str, str]]): Header -> "datetime", "int", "float" or "str" to coerce columns to.
+            required_columns (Optional[List[str]]): Headers that must have a value in every row.
+            required_headers (Optional[List[str]]): If given, the header row must match these headers exactly.
+            on_error (str): "quarantine" to append the valid rows and report the invalid ones, or "raise" to raise
+                RowValidationError and leave the file unchanged if any row is invalid.
+            quarantine_sheet (Optional[str]): If given, invalid rows are also written to this sheet with their errors.
 
-        wb.save(temp_stream)
+        Returns:
+            RowValidationReport: The number of appended rows, the rejected rows with an "Error" column, and the
+                                 input columns not found in the sheet's headers.
+        """
+        with self.open_workbook(folder_name, excel_file_name) as session:
+            report = session.append_batch(
+                sheet_name, rows, column_types, required_columns, required_headers, on_error, quarantine_sheet
+            )
 
-        temp_stream.seek(0)
+        if len(report.rejected):
+            print(f"{len(report.rejected)} rows rejected while appending to '{excel_file_name}':")
+            for failure in report.failures[:10]:
+                print(f"  {failure}")
 
-        self.upload_file_from_bytes(temp_stream.getvalue(), excel_file_name, folder_name)
+        return report
 
     def format_and_sort_excel_file(
         self,
@@ -378,165 +1284,120 @@ class Sharepoint:
 
         # Step 1 - Fetch the file to update from SharePoint and load it as a workbook
         # This ensures we don't override any other sheets in the excel file
-        binary_file = self.fetch_file_using_open_binary(excel_file_name, folder_name)
-        if binary_file is None:
-            raise FileNotFoundError(f"File '{excel_file_name}' not found in folder '{folder_name}'.")
-
-        wb = load_workbook(BytesIO(binary_file))
-        if sheet_name not in wb.sheetnames:
-            raise ValueError(f"Sheet '{sheet_name}' not found in '{excel_file_name}'")
-
-        ws = wb[sheet_name]
-
-        # Step 2 - Read data into DataFrame
-        rows = list(ws.iter_rows(values_only=True))
-        header, *data_rows = rows
-        df = pd.DataFrame(data_rows, columns=header)
-
-        # Step 3 – Prepare sorting logic
-        # For each sorting instruction, we:
-        # - Extract the column to sort by (using letter, index, or name)
-        # - Convert the column values to the desired data type if specified (str, int, float, datetime)
-        # - Track which columns to sort and in which order (ascending or descending)
-        #
-        # This ensures the DataFrame is sorted correctly, even when types like dates or numbers need conversion.
-        if sorting_keys:
-            sort_columns = []
-            ascending_flags = []
-
-            for item in sorting_keys:
-                key = item.get("key")
-                ascending = item.get("ascending", True)
-                dtype = item.get("type")
-
-                if isinstance(key, int):
-                    col_name = header[key]
-
-                elif isinstance(key, str) and key.isalpha():
-                    col_name = header[ord(key.upper()) - ord("A")]
-
-                else:
-                    col_name = key
-
-                sort_columns.append(col_name)
-                ascending_flags.append(ascending)
-
-                if dtype == "datetime":
-                    df[col_name] = pd.to_datetime(df[col_name], dayfirst=True, errors="coerce")
-
-                elif dtype == "int":
-                    df[col_name] = pd.to_numeric(df[col_name], errors="coerce", downcast="integer")
-
-                elif dtype == "float":
-                    df[col_name] = pd.to_numeric(df[col_name], errors="coerce", downcast="float")
-
-                elif dtype == "str":
-                    df[col_name] = df[col_name].astype(str)
-
-            # Step 4 – Sort
-            df.sort_values(by=sort_columns, ascending=ascending_flags, inplace=True)
-
-        # Step 5 - Overwrite worksheet
-        ws.delete_rows(1, ws.max_row)
-
-        ws.append(header)
-
-        for _, row in df.iterrows():
-            ws.append(list(row))
-
-        # Step 6 – Adjust column widths and apply wrapping if needed
-        #
-        # If column_widths is "auto":
-        # - Calculate the max content length in each column and set the column width accordingly (+2 for padding)
-        #
-        # If column_widths is a single int:
-        # - Use it as a global max width across all columns
-        # - If content fits, set width based on actual content length
-        # - If content exceeds the max width clamp column width and enable wrap_text for that column's cells
-        #
-        # Then, for wrapped cells, auto-adjust the row height:
-        # - Estimate how many lines the wrapped text would occupy and set row height accordingly to ensure all content is visible
-        if column_widths in (None, "auto"):
-            for col in ws.columns:
-                max_len = max(len(str(cell.value or "")) for cell in col)
-
-                ws.column_dimensions[col[0].column_letter].width = max_len + 2
-
-        elif isinstance(column_widths, int):
-            for col in ws.columns:
-                col_letter = col[0].column_letter
-
-                max_len = max(len(str(cell.value or "")) for cell in col)
-
-                # If content fits, auto-size
-                if max_len + 2 <= column_widths:
-                    ws.column_dimensions[col_letter].width = max_len + 2
-
-                # Else, cap width and enable wrap
-                else:
-                    ws.column_dimensions[col_letter].width = column_widths
-
-                    for cell in col:
-                        cell.alignment = Alignment(wrap_text=True)
-
-            # Here we handle row height
-            for row in ws.iter_rows():
-                max_line_count = 1
-
-                for cell in row:
-                    if cell.value and cell.alignment and cell.alignment.wrap_text:
-                        col_letter = cell.column_letter
-                        col_width = ws.column_dimensions[col_letter].width or 10
-                        chars_per_line = col_width * 1.2
-                        lines = str(cell.value).split("\n")
-                        line_count = sum(math.ceil(len(line) / chars_per_line) for line in lines)
-                        max_line_count = max(max_line_count, line_count)
+        # Steps 2 to 9 are applied in memory, and the workbook is saved and re-uploaded when the session closes
+        with self.open_workbook(folder_name, excel_file_name) as session:
+            session.format_and_sort(
+                sheet_name,
+                sorting_keys=sorting_keys,
+                font_config=font_config,
+                bold_rows=bold_rows,
+                italic_rows=italic_rows,
+                align_horizontal=align_horizontal,
+                align_vertical=align_vertical,
+                column_widths=column_widths,
+                freeze_panes=freeze_panes,
+            )
 
-                ws.row_dimensions[row[0].row].height = max_line_count * 20
+    def iter_excel_sheet(
+        self,
+        folder_name: str,
+        excel_file_name: str,
+        sheet_name: Optional[str] = None,
+        columns: Optional[List[Union[str, int]]] = None,
+        chunk_size: Optional[int] = EXCEL_CHUNK_ROWS,
+        max_retries: int = 3,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streams a worksheet of an Excel file as DataFrames of at most chunk_size rows.
+        The file is downloaded to a temporary file and parsed in read-only mode, so memory use is bounded
+        by the selected columns of one chunk instead of the whole workbook. Formulas are read as their
+        cached values, and rows without any values are skipped.
 
-        else:
-            raise ValueError(f"Column width provided with incorrect datatype - datatype int expected, instead column width is of datatype {type(column_widths)}")
-
-        # Step 7 - Freeze panes if needed
-        if freeze_panes:
-            ws.freeze_panes = freeze_panes
-
-        # Step 8 – Apply base formatting
-        # For each cell in the worksheet:
-        # - Apply font styling based on either a custom `font_config` (row-specific) or default to bold/italic based on row number (e.g., header rows)
-        # - Set horizontal and vertical alignment for consistent layout
-        # - Disable text wrapping by default (wrapping will be handled later if needed)
-        #
-        # This ensures a clean, uniform look across the sheet while allowing for custom styling where defined.
-        for row_idx, row in enumerate(ws.iter_rows(), start=1):
-            for cell in row:
-                if font_config and row_idx in font_config:
-                    config = font_config[row_idx]
-
-                    cell.font = Font(
-                        name=config.get("name", "Calibri"),
-                        size=config.get("size", 11),
-                        bold=config.get("bold", False),
-                        italic=config.get("italic", False),
-                    )
+        Args:
+            folder_name (str): Name of the folder where the file resides.
+            excel_file_name (str): Name of the excel file.
+            sheet_name (Optional[str]): Name of the sheet to read. Defaults to the first sheet.
+            columns (Optional[List[Union[str, int]]]): Columns to read, as header names, column letters or
+                0-based indexes. Defaults to all columns.
+            chunk_size (Optional[int]): Maximum number of rows per DataFrame, or None for a single DataFrame.
+            max_retries (int): Retries on throttling (HTTP 429/503) or connection errors for the download.
+
+        Yields:
+            pd.DataFrame: The next rows of the sheet, with the header row as column names.
+                          A sheet without data rows yields a single empty DataFrame.
+        """
+        if not self.ctx:
+            raise ConnectionError("Not authenticated to SharePoint.")
 
+        with tempfile.TemporaryFile() as temp_file:
+            try:
+                self.download_file_stream(folder_name, excel_file_name, temp_file, max_retries=max_retries)
+            except requests.RequestException as e:
+                if e.response is not None and e.response.status_code == 404:
+                    raise FileNotFoundError(f"File '{excel_file_name}' not found in folder '{folder_name}'.") from e
+                raise
+
+            temp_file.seek(0)
+            wb = load_workbook(temp_file, read_only=True, data_only=True)
+            try:
+                if sheet_name is None:
+                    ws = wb.worksheets[0]
+                elif sheet_name in wb.sheetnames:
+                    ws = wb[sheet_name]
                 else:
-                    cell.font = Font(
-                        bold=row_idx in bold_rows if bold_rows else False,
-                        italic=row_idx in italic_rows if italic_rows else False,
-                    )
-
-                cell.alignment = Alignment(
-                    horizontal=align_horizontal,
-                    vertical=align_vertical,
-                    wrap_text=cell.alignment.wrap_text
-                )
-
-        # Step 9 - Save and re-upload
-        temp_stream = BytesIO()
-
-        wb.save(temp_stream)
+                    raise ValueError(f"Sheet '{sheet_name}' not found in '{excel_file_name}'")
+
+                header = next(ws.iter_rows(max_row=1, values_only=True), ())
+                indexes = resolve_columns(header, columns)
+                names = [header[i] for i in indexes]
+
+                # Only the span of the selected columns is read, with the indexes relative to its first column
+                first, last = (min(indexes), max(indexes)) if indexes else (0, 0)
+                width = last - first + 1
+                selected = [i - first for i in indexes]
+
+                chunk = []
+                yielded = False
+                for row in ws.iter_rows(min_row=2, min_col=first + 1, max_col=last + 1, values_only=True):
+                    if len(row) < width:
+                        row = row + (None,) * (width - len(row))
+
+                    values = tuple(row[i] for i in selected)
+                    if all(value is None for value in values):
+                        continue
+
+                    chunk.append(values)
+                    if chunk_size and len(chunk) >= chunk_size:
+                        yield pd.DataFrame.from_records(chunk, columns=names)
+                        yielded = True
+                        chunk = []
+
+                if chunk or not yielded:
+                    yield pd.DataFrame.from_records(chunk, columns=names)
+            finally:
+                wb.close()
+
+    def read_excel_sheet(
+        self,
+        folder_name: str,
+        excel_file_name: str,
+        sheet_name: Optional[str] = None,
+        columns: Optional[List[Union[str, int]]] = None,
+        max_retries: int = 3,
+    ) -> pd.DataFrame:
+        """
+        Reads a worksheet of an Excel file into a DataFrame with a streaming, read-only parser.
+        See iter_excel_sheet for reading very large sheets in chunks.
 
-        temp_stream.seek(0)
+        Args:
+            folder_name (str): Name of the folder where the file resides.
+            excel_file_name (str): Name of the excel file.
+            sheet_name (Optional[str]): Name of the sheet to read. Defaults to the first sheet.
+            columns (Optional[List[Union[str, int]]]): Columns to read, as header names, column letters or
+                0-based indexes. Defaults to all columns.
+            max_retries (int): Retries on throttling (HTTP 429/503) or connection errors for the download.
 
-        self.upload_file_from_bytes(temp_stream.getvalue(), excel_file_name, folder_name)
+        Returns:
+            pd.DataFrame: The rows of the sheet, with the header row as column names.
+        """
+        return next(self.iter_excel_sheet(folder_name, excel_file_name, sheet_name, columns, None, max_retries))
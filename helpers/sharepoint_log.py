@@ -0,0 +1,301 @@
+"""
+An append-only log sink for SharePoint, as an alternative to appending every event to an Excel file.
+
+Appending to a workbook downloads and re-uploads the whole file, so logging gets slower as the log grows.
+The sink instead buffers rows in memory and flushes them as new, immutable segment files (CSV or Parquet)
+into a folder, which costs the same no matter how many segments already exist. A compaction step merges
+the segments into one consolidated Excel or Parquet file and removes them, either when called or on a
+schedule checked at every flush. Compaction is meant to run from a single process per folder.
+
+Usage:
+    with sp.log_sink("Logs", headers=["Time", "User", "Event"], compact_to="audit.xlsx", compact_interval=3600) as log:
+        log.write({"Time": datetime.now(), "User": user, "Event": "login"})
+"""
+
+import importlib.util
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from io import BytesIO
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import requests
+
+if TYPE_CHECKING:
+    from helpers.sharepoint_class import Sharepoint
+
+SEGMENT_FORMATS = ("csv", "parquet")
+
+# Longest wait before the next automatic flush after failed flushes, in seconds
+FLUSH_RETRY_MAX_DELAY = 600.0
+
+
+class SharepointLogSink:  # pylint: disable=too-many-instance-attributes
+    """
+    Buffers log rows and writes them to SharePoint as append-only segment files.
+
+    Attributes:
+        folder_name (str): The folder in the document library holding the segments.
+        headers (Optional[List[str]]): The columns of the log. Taken from the first row if not given.
+        segment_format (str): "csv" or "parquet". Parquet requires pyarrow.
+        prefix (str): Segment files are named "<prefix>-<UTC timestamp>-<id>.<format>".
+        flush_rows (int): The buffer is flushed when it holds this many rows.
+        flush_interval (float): The buffer is flushed by the first write this many seconds after the last flush.
+        compact_to (Optional[str]): Name of the consolidated file (.xlsx or .parquet) used by scheduled compaction.
+        compact_interval (Optional[float]): If set with compact_to, a flush compacts the segments when this many
+            seconds have passed since the last compaction.
+        max_buffer_rows (int): Most rows kept while flushes fail. Beyond it the oldest rows are dropped.
+        dropped_rows (int): Number of rows dropped because the buffer was full.
+
+    A failed flush keeps its rows in the buffer, and writes do not flush again until a delay has passed,
+    doubling from flush_interval up to FLUSH_RETRY_MAX_DELAY, so an outage does not block every write.
+    """
+
+    def __init__(
+        self,
+        sharepoint: "Sharepoint",
+        folder_name: str,
+        headers: Optional[List[str]] = None,
+        segment_format: str = "csv",
+        prefix: str = "log",
+        flush_rows: int = 1000,
+        flush_interval: float = 60.0,
+        compact_to: Optional[str] = None,
+        compact_interval: Optional[float] = None,
+        max_retries: int = 3,
+        max_buffer_rows: int = 100_000,
+    ):
+        if segment_format not in SEGMENT_FORMATS:
+            raise ValueError(f"segment_format must be one of {SEGMENT_FORMATS}, got '{segment_format}'")
+
+        uses_parquet = segment_format == "parquet" or (compact_to or "").endswith(".parquet")
+        if uses_parquet and importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("Parquet log segments and files require pyarrow. Install it, or use CSV segments and an .xlsx file.")
+
+        self.sharepoint = sharepoint
+        self.folder_name = folder_name
+        self.headers = list(headers) if headers else None
+        self.segment_format = segment_format
+        self.prefix = prefix
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.compact_to = compact_to
+        self.compact_interval = compact_interval
+        self.max_retries = max_retries
+        self.max_buffer_rows = max_buffer_rows
+        self.dropped_rows = 0
+
+        self._buffer: deque[Tuple[Any, ...]] = deque(maxlen=max_buffer_rows)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._last_compact = time.monotonic()
+        self._failed_flushes = 0
+        self._next_flush_at = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def write(self, row: Dict[str, Any]):
+        """
+        Buffers a row, flushing the buffer when it is full or the flush interval has passed.
+
+        Args:
+            row (Dict[str, Any]): The row, keyed by header. Missing columns are left empty.
+        """
+        with self._lock:
+            if self.headers is None:
+                self.headers = list(row.keys())
+
+            if len(self._buffer) == self.max_buffer_rows:
+                self.dropped_rows += 1
+            self._buffer.append(tuple(row.get(header) for header in self.headers))
+
+            now = time.monotonic()
+            due = now >= self._next_flush_at and (
+                len(self._buffer) >= self.flush_rows or now - self._last_flush >= self.flush_interval
+            )
+
+        if due:
+            self.flush()
+
+    def flush(self) -> Optional[str]:
+        """
+        Writes the buffered rows to a new segment file and uploads it. If the upload fails, the rows are kept
+        in the buffer, and writes wait for the retry delay before flushing them again.
+
+        Returns:
+            Optional[str]: The name of the uploaded segment, or None if nothing was uploaded.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = list(self._buffer), deque(maxlen=self.max_buffer_rows)
+                self._last_flush = time.monotonic()
+
+            if not rows:
+                return None
+
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+            segment_name = f"{self.prefix}-{stamp}-{uuid.uuid4().hex[:8]}.{self.segment_format}"
+
+            try:
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    segment_path = os.path.join(temp_dir, segment_name)
+                    frame = pd.DataFrame.from_records(rows, columns=self.headers)
+                    if self.segment_format == "csv":
+                        frame.to_csv(segment_path, index=False)
+                    else:
+                        frame.to_parquet(segment_path, index=False)
+
+                    result = self.sharepoint.upload_local_file(self.folder_name, segment_path, self.max_retries)
+
+                if not result or not result.success:
+                    raise RuntimeError(result.error if result else "Not authenticated to SharePoint.")
+            except Exception as e:
+                with self._lock:
+                    # The failed rows go back in front of the rows written meanwhile, dropping the oldest beyond the cap
+                    self.dropped_rows += max(0, len(rows) + len(self._buffer) - self.max_buffer_rows)
+                    self._buffer = deque(chain(rows, self._buffer), maxlen=self.max_buffer_rows)
+                    self._failed_flushes += 1
+                    delay = min(max(self.flush_interval, 1.0) * 2 ** (self._failed_flushes - 1), FLUSH_RETRY_MAX_DELAY)
+                    self._next_flush_at = time.monotonic() + delay
+                print(
+                    f"Failed to flush {len(rows)} log rows to '{self.folder_name}', retrying in {delay:.0f}s "
+                    f"({self.dropped_rows} rows dropped so far): {e}"
+                )
+                return None
+
+            with self._lock:
+                self._failed_flushes = 0
+                self._next_flush_at = 0.0
+
+            if self.compact_to and self.compact_interval is not None and time.monotonic() - self._last_compact >= self.compact_interval:
+                # The segment is uploaded, so a failed compaction is reported and left for the next schedule
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"Failed to compact log segments in '{self.folder_name}': {e}")
+
+            return segment_name
+
+    def close(self):
+        """Flushes the remaining buffered rows."""
+        self.flush()
+
+    def _segment_names(self) -> List[str]:
+        """Returns the names of the segment files in the folder, oldest first."""
+        suffix = f".{self.segment_format}"
+        return sorted(
+            file["Name"]
+            for file in self.sharepoint.iter_files(self.folder_name)
+            if file["Name"].startswith(f"{self.prefix}-") and file["Name"].endswith(suffix)
+        )
+
+    def _read_segments(self, segment_names: List[str], batch_size: int = 100) -> Iterator[pd.DataFrame]:
+        """Downloads segments in $batch requests of batch_size files and yields them as DataFrames, in order."""
+        for i in range(0, len(segment_names), batch_size):
+            with self.sharepoint.batch(batch_size=batch_size, max_retries=self.max_retries) as batch:
+                operations = [batch.read_file(name, self.folder_name) for name in segment_names[i:i + batch_size]]
+
+            for name, operation in zip(segment_names[i:i + batch_size], operations):
+                if not operation.success:
+                    raise RuntimeError(f"Failed to read log segment '{name}': {operation.error}")
+
+                if self.segment_format == "csv":
+                    # Read as text, so identifiers keep their leading zeros and empty values stay empty
+                    frame = pd.read_csv(BytesIO(operation.result), dtype=str, keep_default_na=False)
+                else:
+                    frame = pd.read_parquet(BytesIO(operation.result))
+
+                yield frame.reindex(columns=self.headers) if self.headers else frame
+
+    def _read_consolidated(self, file_name: str) -> Iterator[pd.DataFrame]:
+        """Yields the rows already in the consolidated file, or nothing if it does not exist yet."""
+        if file_name.endswith(".xlsx"):
+            try:
+                yield from self.sharepoint.iter_excel_sheet(self.folder_name, file_name)
+            except FileNotFoundError:
+                return
+            return
+
+        content = BytesIO()
+        try:
+            self.sharepoint.download_file_stream(self.folder_name, file_name, content, max_retries=self.max_retries)
+        except requests.RequestException as e:
+            if e.response is not None and e.response.status_code == 404:
+                return
+            raise
+
+        content.seek(0)
+        yield pd.read_parquet(content)
+
+    def compact(self, file_name: Optional[str] = None, delete_segments: bool = True) -> int:
+        """
+        Merges the existing consolidated file and all segments in the folder into a new consolidated file,
+        and deletes the merged segments once it is uploaded. Segments flushed while compacting are left
+        for the next compaction.
+
+        An Excel file is streamed through a write-only workbook. A Parquet file is built in memory and
+        requires pyarrow. CSV segments are read back as text, so no column types are inferred.
+
+        Args:
+            file_name (Optional[str]): Name of the consolidated file, ending in .xlsx or .parquet. Defaults to compact_to.
+            delete_segments (bool): If True, the merged segments are deleted after the upload.
+
+        Returns:
+            int: The number of segments merged.
+        """
+        file_name = file_name or self.compact_to
+        if not file_name or not file_name.endswith((".xlsx", ".parquet")):
+            raise ValueError(f"The consolidated file must be an .xlsx or .parquet file, got '{file_name}'")
+
+        self._last_compact = time.monotonic()
+        if not self.sharepoint.ctx:
+            print(f"Failed to compact log segments in '{self.folder_name}'")
+            return 0
+
+        segment_names = self._segment_names()
+        if not segment_names:
+            return 0
+
+        frames = chain(self._read_consolidated(file_name), self._read_segments(segment_names))
+
+        if file_name.endswith(".xlsx"):
+            result = self.sharepoint.upload_report(self.folder_name, file_name, frames, headers=self.headers)
+        else:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_path = os.path.join(temp_dir, file_name)
+                try:
+                    pd.concat(frames, ignore_index=True).to_parquet(file_path, index=False)
+                except Exception as e:
+                    print(f"Failed to compact log segments into '{file_name}': {e}")
+                    return 0
+
+                result = self.sharepoint.upload_local_file(self.folder_name, file_path, self.max_retries)
+
+        if not result or not result.success:
+            print(f"Failed to compact log segments into '{file_name}': {result.error if result else 'not authenticated'}")
+            return 0
+
+        if delete_segments:
+            with self.sharepoint.batch(max_retries=self.max_retries) as batch:
+                deletions = [batch.delete_file(name, self.folder_name) for name in segment_names]
+
+            failed = [operation for operation in deletions if not operation.success]
+            if failed:
+                print(
+                    f"Failed to delete {len(failed)} compacted log segments in '{self.folder_name}'. "
+                    "Remove them before the next compaction, or their rows are merged twice."
+                )
+
+        print(f"Compacted {len(segment_names)} log segments into '{file_name}'.")
+        return len(segment_names)
@@ -0,0 +1,16 @@
+"""
+Small building blocks for SharePoint REST requests, shared by the Sharepoint class and its $batch requests.
+"""
+
+from urllib.parse import quote
+
+# HTTP status codes SharePoint uses to signal throttling
+THROTTLING_STATUS_CODES = (429, 503)
+
+# Base delay in seconds for exponential backoff when no Retry-After header is sent
+RETRY_BASE_DELAY = 1.0
+
+
+def odata_path(value: str) -> str:
+    """Escapes a path for use as a quoted literal in an OData url, e.g. DecodedUrl='<value>'."""
+    return quote(value.replace("'", "''"))
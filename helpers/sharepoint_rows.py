@@ -0,0 +1,169 @@
+"""
+Columnar mapping, validation and type coercion of rows before they are appended to a worksheet.
+
+Rows are given as a list of dicts or a DataFrame and mapped onto the sheet's headers once, column by column,
+instead of looking up every header in every dict. Columns with a declared type are coerced with vectorized
+pandas conversions, and rows that fail coercion or miss a required value are split off together with the
+reason, so they can be rejected or quarantined before anything is written.
+
+Usage:
+    values, report = validate_rows(rows, headers, column_types={"Dato": "datetime", "Beløb": "float"})
+    for row in values:
+        ws.append(row)
+    print(report.failures)
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Types a column can be coerced to, using the same names as the sorting keys of format_and_sort_excel_file
+COLUMN_TYPES = ("datetime", "int", "float", "str")
+
+# Dates starting with the year, like 2024-01-05 or 2024/01/05, optionally followed by a time
+YEAR_FIRST_DATE = r"\s*\d{4}[-/.]\d{1,2}[-/.]\d{1,2}"
+
+Rows = Union[pd.DataFrame, Dict[str, Any], List[Dict[str, Any]]]
+
+
+@dataclass
+class RowValidationReport:
+    """Outcome of validating a batch of rows"""
+
+    accepted: int = 0
+    rejected: pd.DataFrame = field(default_factory=pd.DataFrame)
+    unknown_columns: List[str] = field(default_factory=list)
+
+    @property
+    def failures(self) -> List[str]:
+        """One message per rejected row, with the row's position in the batch."""
+        return [f"Row {position}: {error}" for position, error in self.rejected.get("Error", pd.Series()).items()]
+
+
+class RowValidationError(ValueError):
+    """Raised when a batch contains invalid rows and they are not to be quarantined"""
+
+    def __init__(self, report: RowValidationReport):
+        failures = report.failures
+        summary = "\n".join(failures[:10]) + (f"\n... and {len(failures) - 10} more" if len(failures) > 10 else "")
+        super().__init__(f"{len(failures)} rows failed validation:\n{summary}")
+        self.report = report
+
+
+def _to_frame(rows: Rows) -> pd.DataFrame:
+    """Builds an object DataFrame from the rows, keeping the original Python values."""
+    if isinstance(rows, pd.DataFrame):
+        return rows.reset_index(drop=True).astype(object)
+
+    if isinstance(rows, dict):
+        rows = [rows]
+
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        raise TypeError("rows must be a DataFrame, a dict or a list of dicts.")
+
+    # Keys missing from a dict become NaN, while explicit None values are kept as None
+    return pd.DataFrame(rows, dtype=object)
+
+
+def _coerce_column(column: pd.Series, dtype: str) -> Tuple[pd.Series, pd.Series]:
+    """
+    Coerces a column to a type.
+
+    Returns:
+        Tuple[pd.Series, pd.Series]: The coerced values as Python objects with None for missing values,
+                                     and a mask of the values that were present but could not be coerced.
+    """
+    present = column.notna() & (column != "")
+
+    if dtype == "datetime":
+        # Year-first values (ISO dates) are parsed as they are; dayfirst would swap their day and month
+        year_first = present & column.astype(str).str.match(YEAR_FIRST_DATE)
+        coerced = pd.to_datetime(column.where(year_first), errors="coerce", format="mixed").where(
+            year_first, pd.to_datetime(column.where(present & ~year_first), dayfirst=True, errors="coerce", format="mixed")
+        )
+        invalid = present & coerced.isna()
+        return coerced.astype(object).where(coerced.notna(), None), invalid
+
+    if dtype in ("int", "float"):
+        coerced = pd.to_numeric(column.where(present), errors="coerce")
+        invalid = present & coerced.isna()
+
+        if dtype == "int":
+            invalid |= coerced.notna() & (coerced % 1 != 0)
+            valid = coerced.notna() & ~invalid
+            return coerced.where(valid, 0).astype(np.int64).astype(object).where(valid, None), invalid
+
+        return coerced.astype(object).where(coerced.notna(), None), invalid
+
+    return column.astype(str).astype(object).where(present, None), pd.Series(False, index=column.index)
+
+
+def validate_rows(
+    rows: Rows,
+    headers: List[str],
+    column_types: Optional[Dict[str, str]] = None,
+    required_columns: Optional[List[str]] = None,
+) -> Tuple[List[List[Any]], RowValidationReport]:
+    """
+    Maps rows onto headers and validates and coerces them column-wise.
+
+    Columns without a declared type keep their values as they are, and a column missing from a row is
+    written as an empty string, as append_row_to_sharepoint_excel always did. Typed columns are coerced,
+    and missing values in them are left as empty cells.
+
+    Args:
+        rows (Rows): A DataFrame, a dict or a list of dicts keyed by header.
+        headers (List[str]): The headers of the sheet, in column order.
+        column_types (Optional[Dict[str, str]]): Header -> "datetime", "int", "float" or "str".
+        required_columns (Optional[List[str]]): Headers that must have a value in every row.
+
+    Returns:
+        Tuple[List[List[Any]], RowValidationReport]: The values of the valid rows in header order, and a report
+            with the number of accepted rows, the rejected rows with an "Error" column, and the input columns
+            not found in the headers.
+    """
+    column_types = column_types or {}
+    required_columns = required_columns or []
+
+    for header, dtype in column_types.items():
+        if header not in headers:
+            raise ValueError(f"Column '{header}' in column_types not found in headers {headers}")
+        if dtype not in COLUMN_TYPES:
+            raise ValueError(f"Unknown type '{dtype}' for column '{header}', expected one of {COLUMN_TYPES}")
+
+    for header in required_columns:
+        if header not in headers:
+            raise ValueError(f"Required column '{header}' not found in headers {headers}")
+
+    frame = _to_frame(rows)
+    missing_column = pd.Series(np.nan, index=frame.index, dtype=object)
+    errors = pd.Series("", index=frame.index, dtype=object)
+    columns = []
+
+    for header in headers:
+        column = frame[header] if header in frame.columns else missing_column
+
+        if header in column_types:
+            values, invalid = _coerce_column(column, column_types[header])
+            errors = errors.where(~invalid, errors + f"{header}: not a valid {column_types[header]}; ")
+        else:
+            values = column.where(column.notna() | np.equal(column.to_numpy(), None), "")
+
+        if header in required_columns:
+            missing = column.isna() | (column == "")
+            errors = errors.where(~missing, errors + f"{header}: missing required value; ")
+
+        columns.append(values.to_numpy())
+
+    rejected = (errors != "").to_numpy()
+    matrix = np.column_stack(columns) if columns else np.empty((len(frame), 0), dtype=object)
+
+    report = RowValidationReport(
+        accepted=int((~rejected).sum()),
+        rejected=frame[rejected].assign(Error=errors[rejected].str.rstrip("; ")),
+        unknown_columns=[str(column) for column in frame.columns if column not in headers],
+    )
+
+    return matrix[~rejected].tolist(), report
@@ -0,0 +1,99 @@
+"""Helper module to authenticate and probe several SharePoint sites concurrently"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from helpers.sharepoint_class import Sharepoint
+
+
+@dataclass
+class SiteProbeResult:
+    """Outcome of authenticating and probing a single SharePoint site"""
+
+    site_name: str
+    success: bool
+    latency: float
+    title: str | None = None
+    error: str | None = None
+    sharepoint: Sharepoint | None = None
+
+
+def probe_site(site_name: str, **sharepoint_kwargs) -> SiteProbeResult:
+    """
+    Authenticate to a single site and time the round trip.
+
+    Args:
+        site_name (str): Name of the site, as used in /teams/<site_name>.
+        **sharepoint_kwargs: Remaining keyword arguments passed on to Sharepoint.
+
+    Returns:
+        SiteProbeResult: Latency, success/failure and site title for the site.
+    """
+    start = time.perf_counter()
+    try:
+        sp = Sharepoint(site_name=site_name, **sharepoint_kwargs)
+    except Exception as e:
+        return SiteProbeResult(
+            site_name=site_name,
+            success=False,
+            latency=time.perf_counter() - start,
+            error=str(e),
+        )
+
+    return SiteProbeResult(
+        site_name=site_name,
+        success=sp.ctx is not None,
+        latency=time.perf_counter() - start,
+        title=sp.site_title,
+        error=str(sp.auth_error) if sp.auth_error else None,
+        sharepoint=sp if sp.ctx is not None else None,
+    )
+
+
+def probe_sites(
+    site_names: list[str], max_workers: int, **sharepoint_kwargs
+) -> list[SiteProbeResult]:
+    """
+    Authenticate to and probe all sites in parallel with bounded concurrency.
+    Wall-clock time is roughly that of the slowest site instead of the sum of all of them.
+
+    Args:
+        site_names (list[str]): Names of the sites to probe.
+        max_workers (int): Maximum number of sites probed at the same time.
+        **sharepoint_kwargs: Keyword arguments shared by every Sharepoint instance
+            (tenant, client_id, thumbprint, cert_path, site_url, document_library).
+
+    Returns:
+        list[SiteProbeResult]: One result per site, in the order of site_names.
+    """
+    if not site_names:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(site_names)))) as pool:
+        return list(
+            pool.map(lambda name: probe_site(name, **sharepoint_kwargs), site_names)
+        )
+
+
+def format_probe_table(results: list[SiteProbeResult]) -> str:
+    """Render probe results as a plain text table for logging"""
+    rows = [("Site", "Status", "Latency (s)", "Title / Error")]
+    for res in results:
+        rows.append(
+            (
+                res.site_name,
+                "OK" if res.success else "FAILED",
+                f"{res.latency:.2f}",
+                (res.title if res.success else res.error) or "",
+            )
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = [
+        "  ".join(value.ljust(width) for value, width in zip(row, widths, strict=True)).rstrip()
+        for row in rows
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+
+    return "\n".join(lines)
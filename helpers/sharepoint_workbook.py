@@ -0,0 +1,616 @@
+"""
+Workbook-level helpers for the Sharepoint class: appending, validating, sorting and formatting rows in a
+worksheet, writing large reports through a write-only workbook, and WorkbookSession, which loads a workbook
+from SharePoint once, applies any number of these steps in memory and uploads it once.
+
+Usage:
+    with sp.open_workbook("Logs", "log.xlsx") as session:
+        session.append_rows("Sheet1", new_rows)
+        session.format_and_sort("Sheet1", sorting_keys=[{"key": "A", "type": "datetime"}])
+"""
+
+from io import BytesIO
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import requests
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.worksheet.worksheet import Worksheet
+from office365.runtime.http.http_method import HttpMethod
+from office365.runtime.http.request_options import RequestOptions
+
+from helpers.sharepoint_rows import Rows, RowValidationError, RowValidationReport, validate_rows
+
+if TYPE_CHECKING:
+    from helpers.sharepoint_class import Sharepoint
+
+# Number of leading rows used to size columns when a report is written with column_widths="auto"
+REPORT_WIDTH_SAMPLE_ROWS = 1000
+
+
+def ensure_row_list(new_rows: Union[Dict, List[Dict]]) -> List[Dict]:
+    """Ensures new_rows is a list of dicts, wrapping a single dict in a list."""
+    if isinstance(new_rows, dict):
+        return [new_rows]
+
+    if not isinstance(new_rows, list) or not all(isinstance(r, dict) for r in new_rows):
+        raise TypeError("new_rows must be a dict or a list of dicts.")
+
+    return new_rows
+
+
+def append_rows_to_sheet(
+    ws: Worksheet,
+    sheet_name: str,
+    new_rows: Rows,
+    required_headers: Optional[List[str]] = None,
+    column_types: Optional[Dict[str, str]] = None,
+    required_columns: Optional[List[str]] = None,
+    on_error: str = "raise",
+) -> RowValidationReport:
+    """
+    Appends one or more rows to a worksheet in memory, after validating the headers and removing empty rows.
+    The rows are mapped onto the headers column-wise and validated before the sheet is changed.
+
+    Args:
+        ws (Worksheet): The worksheet to append to.
+        sheet_name (str): Name of the sheet, used in error messages.
+        new_rows (Rows): The rows to append, as a DataFrame, a dict or a list of dicts keyed by header.
+        required_headers (Optional[List[str]]): If given, the header row must match these headers exactly.
+        column_types (Optional[Dict[str, str]]): Header -> "datetime", "int", "float" or "str" to coerce columns to.
+        required_columns (Optional[List[str]]): Headers that must have a value in every row.
+        on_error (str): "raise" to raise RowValidationError without appending anything if any row is invalid,
+            or "quarantine" to append the valid rows and return the invalid ones in the report.
+
+    Returns:
+        RowValidationReport: The number of appended rows and the rejected rows.
+    """
+    if on_error not in ("raise", "quarantine"):
+        raise ValueError(f"on_error must be 'raise' or 'quarantine', got '{on_error}'")
+
+    headers = [cell.value for cell in ws[1]]
+
+    # 2. Validate headers
+    if required_headers:
+        if headers != required_headers:
+            raise ValueError(
+                f"Header mismatch in sheet '{sheet_name}'!\n"
+                f"Expected: {required_headers}\n"
+                f"Found:    {headers}"
+            )
+
+    # 2.25 Map the rows onto the header order and validate them, column by column
+    values, report = validate_rows(new_rows, headers, column_types, required_columns)
+    if on_error == "raise" and len(report.rejected):
+        raise RowValidationError(report)
+
+    # 2.5 Clean up empty rows before appending
+    remove_empty_rows(ws)
+
+    # 3. Append the new rows
+    for row_values in values:
+        ws.append(row_values)
+
+    return report
+
+
+def remove_empty_rows(ws: Worksheet):
+    """
+    Removes rows without any values below the header, in one pass over the stored cells.
+
+    Instead of checking every row and calling ws.delete_rows for each empty one (which shifts all rows
+    below it every time), the rows holding values are found once, and every remaining cell is moved
+    to its compacted row in a single rebuild of the worksheet's cell index.
+    """
+    # pylint: disable=protected-access
+    occupied = np.unique(np.fromiter(
+        (row for (row, _), cell in ws._cells.items() if row > 1 and cell.value is not None),
+        dtype=np.int64,
+    ))
+    last_row = 1 + len(occupied)
+
+    # No interior gaps: the occupied rows are already 2..last_row, so only trailing empty rows remain
+    if ws.max_row == last_row and (len(occupied) == 0 or occupied[-1] == last_row):
+        return
+
+    new_rows = dict(zip(occupied.tolist(), range(2, last_row + 1)))
+    cells = {}
+    for (row, column), cell in ws._cells.items():
+        if row > 1:
+            if row not in new_rows:
+                continue
+            row = new_rows[row]
+            cell.row = row
+        cells[(row, column)] = cell
+
+    ws._cells = cells
+    ws._current_row = last_row
+
+
+def format_and_sort_sheet(
+    ws: Worksheet,
+    sorting_keys: Optional[List[Dict[str, Any]]] = None,
+    font_config: Optional[Dict[int, Dict[str, Any]]] = None,
+    bold_rows: Optional[List[int]] = None,
+    italic_rows: Optional[List[int]] = None,
+    align_horizontal: str = "center",
+    align_vertical: str = "center",
+    column_widths: Any = "auto",
+    freeze_panes: Optional[str] = None,
+):
+    """
+    Sorts and formats a worksheet in memory. See Sharepoint.format_and_sort_excel_file for the parameters.
+    """
+    # Step 2 - Read data into a NumPy array, keeping the original cell values
+    header, *data_rows = ws.iter_rows(values_only=True)
+    values = np.array(data_rows, dtype=object).reshape(len(data_rows), len(header))
+
+    # Step 3 – Prepare sorting logic
+    # For each sorting instruction, we:
+    # - Extract the column to sort by (using letter, index, or name)
+    # - Convert a copy of the column values to the desired data type if specified (str, int, float, datetime)
+    # - Track which columns to sort and in which order (ascending or descending)
+    #
+    # This ensures the rows are sorted correctly, even when types like dates or numbers need conversion,
+    # while the cells keep their original values.
+    if sorting_keys:
+        sort_keys = {}
+        ascending_flags = []
+
+        for position, item in enumerate(sorting_keys):
+            key = item.get("key")
+            ascending = item.get("ascending", True)
+            dtype = item.get("type")
+
+            if isinstance(key, int):
+                col_idx = key
+
+            elif isinstance(key, str) and key.isalpha():
+                col_idx = ord(key.upper()) - ord("A")
+
+            else:
+                col_idx = header.index(key)
+
+            column = pd.Series(values[:, col_idx])
+            ascending_flags.append(ascending)
+
+            if dtype == "datetime":
+                column = pd.to_datetime(column, dayfirst=True, errors="coerce")
+
+            elif dtype == "int":
+                column = pd.to_numeric(column, errors="coerce", downcast="integer")
+
+            elif dtype == "float":
+                column = pd.to_numeric(column, errors="coerce", downcast="float")
+
+            elif dtype == "str":
+                column = column.astype(str)
+
+            sort_keys[position] = column
+
+        # Step 4 – Sort, by computing the row order from the coerced keys and applying it to the original values
+        order = pd.DataFrame(sort_keys).sort_values(
+            by=list(sort_keys), ascending=ascending_flags, kind="stable"
+        ).index.to_numpy()
+        values = values[order]
+
+        # Step 5 - Write the sorted values back into the existing cells below the header, moving each row's
+        # cell styles (fills, number formats, ...) along with its values
+        # pylint: disable=protected-access
+        rows = list(ws.iter_rows(min_row=2, max_row=len(values) + 1, max_col=len(header)))
+        styles = [[cell._style for cell in row] for row in rows]
+        for row, row_values, source in zip(rows, values, order.tolist()):
+            for cell, value, style in zip(row, row_values, styles[source]):
+                cell.value = value
+                cell._style = style
+
+    # Step 6 – Compute column widths and wrapping from the string lengths of all values at once
+    #
+    # If column_widths is "auto":
+    # - Set each column's width to its max content length (+2 for padding)
+    #
+    # If column_widths is a single int:
+    # - Use it as a global max width across all columns
+    # - If content fits, set width based on actual content length
+    # - If content exceeds the max width clamp column width and enable wrap_text for that column's cells
+    #
+    # The lengths are computed column-wise with pandas from one array of the sheet's values, instead of
+    # walking the cells of every column.
+    if column_widths not in (None, "auto") and not isinstance(column_widths, int):
+        raise ValueError(f"Column width provided with incorrect datatype - datatype int expected, instead column width is of datatype {type(column_widths)}")
+
+    grid = np.vstack([np.array([header], dtype=object), values])
+    text = pd.Series(np.frompyfunc(lambda value: str(value or ""), 1, 1)(grid).ravel(), dtype=object)
+    lengths = text.str.len().to_numpy(dtype=np.int64).reshape(grid.shape)
+    widths = lengths.max(axis=0, initial=0) + 2
+
+    wrapped_columns = np.zeros(len(header), dtype=bool)
+    if isinstance(column_widths, int):
+        wrapped_columns = widths > column_widths
+        widths = np.where(wrapped_columns, column_widths, widths)
+
+    for col_idx, width in enumerate(widths.tolist(), start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    # Step 7 - Freeze panes if needed
+    if freeze_panes:
+        ws.freeze_panes = freeze_panes
+
+    # Step 8 – Apply base formatting in a single pass over the cells
+    # For each cell in the worksheet:
+    # - Apply font styling based on either a custom `font_config` (row-specific) or default to bold/italic based on row number (e.g., header rows)
+    # - Set horizontal and vertical alignment for consistent layout, keeping wrap_text if the cell already wraps
+    #   or its column was capped in step 6
+    #
+    # Only a handful of distinct fonts and alignments exist, so each is registered with the workbook once and
+    # cells are pointed at its id directly. Cells that already have the right ids are left untouched.
+    # pylint: disable=protected-access
+    workbook = ws.parent
+    font_ids = {}
+    alignment_ids = {}
+    existing_wrap = {}
+
+    def row_font_id(row_idx):
+        if font_config and row_idx in font_config:
+            config = font_config[row_idx]
+            key = (True, config.get("name", "Calibri"), config.get("size", 11), config.get("bold", False), config.get("italic", False))
+        else:
+            key = (False, None, None, bold_rows is not None and row_idx in bold_rows, italic_rows is not None and row_idx in italic_rows)
+
+        if key not in font_ids:
+            if key[0]:
+                font = Font(name=key[1], size=key[2], bold=key[3], italic=key[4])
+            else:
+                font = Font(bold=key[3], italic=key[4])
+            font_ids[key] = workbook._fonts.add(font)
+
+        return font_ids[key]
+
+    def alignment_id(wrap_text):
+        if wrap_text not in alignment_ids:
+            alignment_ids[wrap_text] = workbook._alignments.add(
+                Alignment(horizontal=align_horizontal, vertical=align_vertical, wrap_text=wrap_text)
+            )
+        return alignment_ids[wrap_text]
+
+    wrapped_cells = np.zeros(grid.shape, dtype=bool)
+    for row_idx, row in enumerate(ws.iter_rows(), start=1):
+        font_id = row_font_id(row_idx)
+
+        for col_idx, cell in enumerate(row):
+            style = cell._style
+            if style is None:
+                style = cell._style = StyleArray()
+
+            if wrapped_columns[col_idx]:
+                wrap_text = True
+            else:
+                if style.alignmentId not in existing_wrap:
+                    existing_wrap[style.alignmentId] = workbook._alignments[style.alignmentId].wrap_text
+                wrap_text = existing_wrap[style.alignmentId]
+
+            wrapped_cells[row_idx - 1, col_idx] = bool(wrap_text)
+
+            if style.fontId != font_id:
+                style.fontId = font_id
+
+            target_alignment = alignment_id(wrap_text)
+            if style.alignmentId != target_alignment:
+                style.alignmentId = target_alignment
+
+    # Step 9 – With a max width, auto-adjust the row heights of wrapped cells
+    # - Estimate how many lines the wrapped text would occupy and set row height accordingly to ensure all content is visible
+    #
+    # The line counts are computed per column with pandas, only for the cells that actually wrap.
+    if isinstance(column_widths, int):
+        line_counts = np.ones(len(grid), dtype=np.int64)
+        cell_text = text.to_numpy().reshape(grid.shape)
+
+        for col_idx in np.flatnonzero((wrapped_cells & (lengths > 0)).any(axis=0)):
+            rows = np.flatnonzero(wrapped_cells[:, col_idx] & (lengths[:, col_idx] > 0))
+            chars_per_line = widths[col_idx] * 1.2
+            lines = pd.Series(cell_text[rows, col_idx], index=rows).str.split("\n").explode()
+            counts = np.ceil(lines.str.len().astype(float) / chars_per_line).groupby(level=0).sum()
+            line_counts[counts.index] = np.maximum(line_counts[counts.index], counts.to_numpy(dtype=np.int64))
+
+        for row_idx, line_count in enumerate(line_counts.tolist(), start=1):
+            ws.row_dimensions[row_idx].height = line_count * 20
+
+
+def resolve_columns(header: Tuple[Any, ...], columns: Optional[List[Union[str, int]]]) -> List[int]:
+    """
+    Resolves column selectors to 0-based column indexes. A selector is a header name, a column letter
+    (e.g. "C") or a 0-based index. Header names take precedence over letters.
+    """
+    if columns is None:
+        return list(range(len(header)))
+
+    indexes = []
+    for column in columns:
+        if isinstance(column, int):
+            if not 0 <= column < len(header):
+                raise ValueError(f"Column index {column} is out of range for a sheet with {len(header)} columns")
+            indexes.append(column)
+
+        elif column in header:
+            indexes.append(header.index(column))
+
+        elif isinstance(column, str) and column.isalpha() and column_index_from_string(column.upper()) <= len(header):
+            indexes.append(column_index_from_string(column.upper()) - 1)
+
+        else:
+            raise ValueError(f"Column '{column}' not found in header {list(header)}")
+
+    return indexes
+
+
+ReportRows = Union[pd.DataFrame, Iterable[pd.DataFrame], Iterable[Dict[str, Any]], Iterable[Tuple[Any, ...]], Iterable[List[Any]]]
+
+
+def iter_report_rows(rows: ReportRows, headers: Optional[List[str]]) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    """
+    Normalizes report input to a header list and an iterator of value tuples, without materializing the rows.
+
+    Args:
+        rows (ReportRows): A DataFrame, an iterable of DataFrame chunks, or an iterable of dicts or sequences.
+        headers (Optional[List[str]]): The columns to write. Defaults to the DataFrame columns or the keys of the
+            first dict, and is required for rows given as sequences.
+    """
+    if isinstance(rows, pd.DataFrame):
+        rows = [rows]
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return list(headers or []), iter(())
+
+    rows = chain([first], rows)
+
+    if isinstance(first, pd.DataFrame):
+        headers = list(headers or first.columns)
+
+        def _frame_rows():
+            for frame in rows:
+                # Missing values are written as empty cells instead of NaN/NaT
+                frame = frame[headers].astype(object)
+                yield from frame.where(frame.notna(), None).itertuples(index=False, name=None)
+
+        return headers, _frame_rows()
+
+    if isinstance(first, dict):
+        headers = list(headers or first.keys())
+        return headers, (tuple(row.get(header) for header in headers) for row in rows)
+
+    if not headers:
+        raise ValueError("headers must be given when rows are sequences.")
+
+    return list(headers), (tuple(row) for row in rows)
+
+
+def write_report_workbook(
+    path: str,
+    rows: ReportRows,
+    headers: Optional[List[str]] = None,
+    sheet_name: str = "Sheet1",
+    column_widths: Any = "auto",
+    freeze_panes: Optional[str] = "A2",
+) -> int:
+    """
+    Streams rows into a write-only workbook saved at path. Rows are serialized as they are appended, so
+    memory use does not grow with the number of rows.
+
+    Args:
+        path (str): Local path of the workbook to write.
+        rows (ReportRows): The rows to write, see iter_report_rows.
+        headers (Optional[List[str]]): The header row, see iter_report_rows.
+        sheet_name (str): Name of the sheet.
+        column_widths (Any): "auto" to size columns from the header and the first REPORT_WIDTH_SAMPLE_ROWS rows,
+            an int for a fixed width for all columns, a dict of header -> width, or None to keep Excel's default.
+        freeze_panes (Optional[str]): E.g., "A2" to freeze the header row.
+
+    Returns:
+        int: The number of data rows written.
+    """
+    headers, values = iter_report_rows(rows, headers)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+
+    # Column widths and frozen panes are written before the first row, so "auto" sizes from a sample of leading rows
+    sample = []
+    if column_widths == "auto":
+        sample = list(islice(values, REPORT_WIDTH_SAMPLE_ROWS))
+        widths = {
+            header: max((len(str(row[idx] or "")) for row in sample), default=0)
+            for idx, header in enumerate(headers)
+        }
+        widths = {header: max(width, len(str(header or ""))) + 2 for header, width in widths.items()}
+
+    elif isinstance(column_widths, int):
+        widths = dict.fromkeys(headers, column_widths)
+
+    elif isinstance(column_widths, dict) or column_widths is None:
+        widths = column_widths or {}
+
+    else:
+        raise ValueError(f"Column width provided with incorrect datatype - datatype int expected, instead column width is of datatype {type(column_widths)}")
+
+    for col_idx, header in enumerate(headers, start=1):
+        if header in widths:
+            ws.column_dimensions[get_column_letter(col_idx)].width = widths[header]
+
+    if freeze_panes:
+        ws.freeze_panes = freeze_panes
+
+    header_font = Font(bold=True)
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = header_font
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    row_count = 0
+    for row in chain(sample, values):
+        ws.append(row)
+        row_count += 1
+
+    wb.save(path)
+    return row_count
+
+
+class WorkbookConflictError(RuntimeError):
+    """Raised when a workbook was changed in SharePoint after a WorkbookSession loaded it"""
+
+
+class WorkbookSession:
+    """
+    Fetches and parses a SharePoint workbook once, applies any number of appends, sorts and format steps
+    in memory, and saves and uploads it once when the with block exits. The upload is conditional on the
+    ETag the workbook had when it was fetched, so a concurrent writer is detected instead of overwritten.
+
+    Example:
+        with sp.open_workbook("Logs", "log.xlsx") as session:
+            session.append_rows("Sheet1", new_rows)
+            session.format_and_sort("Sheet1", sorting_keys=[{"key": "A", "type": "datetime"}])
+    """
+
+    def __init__(self, sharepoint: "Sharepoint", folder_name: str, excel_file_name: str):
+        """
+        Args:
+            sharepoint (Sharepoint): The authenticated Sharepoint instance.
+            folder_name (str): Name of the folder where the file resides.
+            excel_file_name (str): Name of the excel file.
+        """
+        self.sharepoint = sharepoint
+        self.folder_name = folder_name
+        self.excel_file_name = excel_file_name
+        self.file_url = f"/teams/{sharepoint.site_name}/{sharepoint.document_library}/{folder_name}/{excel_file_name}"
+        self.wb = None
+        self.etag: Optional[str] = None
+        self._dirty = False
+
+    def __enter__(self):
+        self.load()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if exc_type is None and self._dirty:
+            self.save()
+
+    def load(self):
+        """Fetches the workbook and its ETag from SharePoint, through the file cache if the Sharepoint instance has one, and parses it."""
+        if not self.sharepoint.ctx:
+            raise ConnectionError("Not authenticated to SharePoint.")
+
+        try:
+            content, self.etag = self.sharepoint.fetch_file(self.file_url)
+        except requests.RequestException as e:
+            if e.response is not None and e.response.status_code == 404:
+                raise FileNotFoundError(f"File '{self.excel_file_name}' not found in folder '{self.folder_name}'.") from e
+            raise
+
+        self.wb = load_workbook(BytesIO(content))
+        self._dirty = False
+
+    def sheet(self, sheet_name: str) -> Worksheet:
+        """Returns a worksheet of the loaded workbook."""
+        if sheet_name not in self.wb.sheetnames:
+            raise ValueError(f"Sheet '{sheet_name}' not found in '{self.excel_file_name}'")
+        return self.wb[sheet_name]
+
+    def append_rows(
+        self,
+        sheet_name: str,
+        new_rows: Union[Dict, List[Dict]],
+        required_headers: Optional[List[str]] = None,
+    ):
+        """Appends one or more rows to a sheet. See Sharepoint.append_row_to_sharepoint_excel."""
+        new_rows = ensure_row_list(new_rows)
+        append_rows_to_sheet(self.sheet(sheet_name), sheet_name, new_rows, required_headers)
+        self._dirty = True
+
+    def append_batch(
+        self,
+        sheet_name: str,
+        rows: Rows,
+        column_types: Optional[Dict[str, str]] = None,
+        required_columns: Optional[List[str]] = None,
+        required_headers: Optional[List[str]] = None,
+        on_error: str = "quarantine",
+        quarantine_sheet: Optional[str] = None,
+    ) -> RowValidationReport:
+        """
+        Validates and appends a batch of rows to a sheet. See Sharepoint.append_batch_to_sharepoint_excel.
+
+        Returns:
+            RowValidationReport: The number of appended rows and the rejected rows.
+        """
+        ws = self.sheet(sheet_name)
+        report = append_rows_to_sheet(ws, sheet_name, rows, required_headers, column_types, required_columns, on_error)
+
+        if quarantine_sheet and len(report.rejected):
+            headers = [cell.value for cell in ws[1]] + ["Error"]
+            if quarantine_sheet in self.wb.sheetnames:
+                quarantine = self.wb[quarantine_sheet]
+            else:
+                quarantine = self.wb.create_sheet(quarantine_sheet)
+                quarantine.append(headers)
+
+            rejected = report.rejected.reindex(columns=headers).astype(object)
+            for row_values in rejected.where(rejected.notna(), None).itertuples(index=False, name=None):
+                quarantine.append(row_values)
+
+        self._dirty = self._dirty or report.accepted > 0 or bool(quarantine_sheet and len(report.rejected))
+        return report
+
+    def format_and_sort(self, sheet_name: str, **format_options):
+        """Sorts and formats a sheet. See Sharepoint.format_and_sort_excel_file for the options."""
+        format_and_sort_sheet(self.sheet(sheet_name), **format_options)
+        self._dirty = True
+
+    def save(self):
+        """
+        Serializes the workbook and uploads it, provided the file has not changed since it was loaded.
+
+        Raises:
+            WorkbookConflictError: If the file was changed in SharePoint in the meantime.
+        """
+        temp_stream = BytesIO()
+
+        self.wb.save(temp_stream)
+
+        headers = {"X-HTTP-Method": "PUT"}
+        if self.etag:
+            headers["If-Match"] = self.etag
+
+        request = RequestOptions(
+            f"{self.sharepoint.file_endpoint(self.file_url)}/$value",
+            method=HttpMethod.Post,
+            data=temp_stream.getvalue(),
+            headers=headers,
+        )
+        try:
+            response, _ = self.sharepoint.send_with_retry(
+                lambda: self.sharepoint.ctx.pending_request().execute_request_direct(request), 3
+            )
+        except requests.RequestException as e:
+            if e.response is not None and e.response.status_code == 412:
+                raise WorkbookConflictError(
+                    f"'{self.excel_file_name}' in folder '{self.folder_name}' was changed by someone else after it was loaded."
+                ) from e
+            raise
+
+        self.etag = response.headers.get("ETag") or self.sharepoint.get_json(f"{self.sharepoint.file_endpoint(self.file_url)}?$select=ETag").get("ETag")
+        self._dirty = False
+
+        # The uploaded bytes are the current version, so the next load is answered from the cache
+        if self.sharepoint.file_cache and self.etag:
+            self.sharepoint.file_cache.put(self.file_url, self.etag, temp_stream.getvalue())
+        print(f"File '{self.excel_file_name}' uploaded successfully to '{self.folder_name}'.")
@@ -5,7 +5,8 @@ This is the main entry point for the process
 import logging
 import os
 
-from helpers.sharepoint_class import Sharepoint
+from helpers import config
+from helpers.sharepoint_sites import format_probe_table, probe_sites
 
 logger = logging.getLogger(__name__)
 
@@ -95,22 +96,19 @@ if __name__ == "__main__":
     print(f"thumbprint: {thumbprint}")
     print(f"cert_path: {cert_path}")
 
-    for site in sites:
-        logger.info(f"attempting to authenticate to {site}")
-
-        site_name = site.get("site_name")
-        site_url = "https://aarhuskommune.sharepoint.com"
-
-        try:
-            sp = Sharepoint(
-                tenant=tenant,
-                client_id=client_id,
-                thumbprint=thumbprint,
-                cert_path=cert_path,
-                site_url=site_url,
-                site_name=site_name,
-                document_library="Delte dokumenter"
-            )
-
-        except Exception as e:
-            logger.info(f"Error authenticating: {e}")
+    results = probe_sites(
+        [site.get("site_name") for site in sites],
+        max_workers=config.SITE_PROBE_CONCURRENCY,
+        tenant=tenant,
+        client_id=client_id,
+        thumbprint=thumbprint,
+        cert_path=cert_path,
+        site_url="https://aarhuskommune.sharepoint.com",
+        document_library="Delte dokumenter",
+    )
+
+    table = format_probe_table(results)
+
+    logger.info(f"Site probe results:\n{table}")
+
+    print(table)
@@ -1,8 +1,13 @@
 """Module to handle item processing"""
 # from mbu_rpa_core.exceptions import ProcessError, BusinessError
+# from processes.worker_context import worker_sharepoint
 
 
 def process_item(item_data: dict, item_reference: str):
-    """Function to handle item processing"""
+    """
+    Function to handle item processing.
+    Items may be processed in parallel by process_workqueue, so use worker_sharepoint()
+    for SharePoint access instead of a client shared between items.
+    """
     assert item_data, "Item data is required"
     assert item_reference, "Item reference is required"
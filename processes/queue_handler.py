@@ -2,10 +2,24 @@
 
 import asyncio
 import logging
+import time
+from collections import Counter
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
+import requests
 from automation_server_client import Workqueue
 
 from helpers import config
+from helpers.adaptive_limiter import AdaptiveLimiter, backoff_delay
+from helpers.ats_functions import RETRY_STATUS_CODES, WorkqueueReferenceIndex, add_workqueue_items
+
+# Put on the buffer after the last item of the source
+_END = object()
+
+# Responses meaning the payload itself was refused, so a smaller batch may go through
+PAYLOAD_ERROR_STATUS_CODES = (400, 413, 422)
 
 
 def retrieve_items_for_queue() -> list[dict]:
@@ -20,55 +34,338 @@ def retrieve_items_for_queue() -> list[dict]:
     return items
 
 
+async def stream_items_for_queue() -> AsyncIterator[dict]:
+    """
+    Streaming variant of retrieve_items_for_queue.
+    Yield each item as soon as it is read from the source, so concurrent_add can start
+    sending before the source is exhausted and the full dataset is never held in memory.
+    """
+    data = []
+    references = []
+
+    for ref, d in zip(references, data, strict=True):
+        yield {"reference": ref, "data": d}
+
+
+@dataclass
+class EnqueueStats:
+    """Running totals for a queue population run"""
+
+    succeeded: int = 0
+    failed: int = 0
+    requests: int = 0
+    retries: int = 0
+    skipped: int = 0
+    bulk_supported: bool = True
+    failed_references: list[str] = field(default_factory=list)
+
+
+def _is_transient(error: Exception) -> bool:
+    """Connection problems, throttling and server errors are worth retrying as they are."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in RETRY_STATUS_CODES
+
+
+def _is_unsupported(error: Exception) -> bool:
+    """The server has no bulk endpoint."""
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in (404, 405)
+
+
+def _is_rejected(error: Exception) -> bool:
+    """The server refused the payload (bad request, too large or unprocessable), not the caller or the route."""
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in PAYLOAD_ERROR_STATUS_CODES
+
+
+def _retry_after(error: Exception) -> str | None:
+    response = getattr(error, "response", None)
+    return response.headers.get("Retry-After") if response is not None else None
+
+
+def _is_throttled(error: Exception) -> bool:
+    """The backend asked us to slow down."""
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in (429, 503)
+
+
+async def _post(
+    workqueue: Workqueue,
+    payload: list[dict],
+    bulk: bool,
+    limiter: AdaptiveLimiter,
+    executor: ThreadPoolExecutor,
+) -> tuple[list[str], Exception | None]:
+    """
+    Make one request under a slot of the adaptive limiter and report its latency and outcome to it.
+
+    Returns:
+        tuple[list[str], Exception | None]: The references the server reported as failed, and the error if the request failed.
+    """
+    loop = asyncio.get_running_loop()
+
+    async with limiter:
+        start = time.monotonic()
+        try:
+            if bulk:
+                failed = await loop.run_in_executor(executor, add_workqueue_items, workqueue.id, payload)
+            else:
+                await loop.run_in_executor(executor, workqueue.add_item, payload[0]["data"], payload[0]["reference"])
+                failed = []
+        except Exception as e:
+            await limiter.record(
+                time.monotonic() - start,
+                error=_is_transient(e) and not _is_throttled(e),
+                throttled=_is_throttled(e),
+                size=len(payload),
+            )
+            return [], e
+
+        await limiter.record(time.monotonic() - start, size=len(payload))
+        return failed, None
+
+
+async def _send_batch(
+    workqueue: Workqueue,
+    batch: list[dict],
+    stats: EnqueueStats,
+    limiter: AdaptiveLimiter,
+    executor: ThreadPoolExecutor,
+    logger: logging.Logger,
+) -> None:
+    """
+    Send one batch, retrying transient failures with jittered backoff.
+    A batch whose payload is refused (400, 413 or 422), or the part of it the server
+    reported as failed, is split in halves and resent, so a bad item only fails itself.
+    A batch that still fails after its transient retries, or is refused for any other
+    reason (e.g. 401 or 403), is failed as a whole without splitting, so an outage or an
+    expired token does not turn into a flood of smaller requests.
+    """
+    if not stats.bulk_supported and len(batch) > 1:
+        for it in batch:
+            await _send_batch(workqueue, [it], stats, limiter, executor, logger)
+        return
+
+    payload = [
+        {"reference": str(it.get("reference") or ""), "data": {"item": it}}
+        for it in batch
+    ]
+
+    for attempt in range(1, config.MAX_RETRIES + 1):
+        used_bulk = stats.bulk_supported
+        stats.requests += 1
+        failed, error = await _post(workqueue, payload, used_bulk, limiter, executor)
+
+        if error is None:
+            break
+
+        if used_bulk and _is_unsupported(error):
+            if stats.bulk_supported:
+                logger.warning("Bulk endpoint not available, adding items one at a time")
+                stats.bulk_supported = False
+            await _send_batch(workqueue, batch, stats, limiter, executor, logger)
+            return
+
+        if _is_rejected(error):
+            if len(batch) == 1:
+                logger.error(f"Failed to add item {payload[0]['reference']}: {error}")
+                stats.failed += 1
+                stats.failed_references.append(payload[0]["reference"])
+                return
+
+            logger.warning(f"Batch of {len(batch)} items rejected, resending it in halves: {error}")
+            middle = len(batch) // 2
+            await _send_batch(workqueue, batch[:middle], stats, limiter, executor, logger)
+            await _send_batch(workqueue, batch[middle:], stats, limiter, executor, logger)
+            return
+
+        if not _is_transient(error) or attempt >= config.MAX_RETRIES:
+            logger.error(f"Failed to add batch of {len(batch)} items after {attempt} attempts: {error}")
+            stats.failed += len(batch)
+            stats.failed_references.extend(entry["reference"] for entry in payload)
+            return
+
+        stats.retries += 1
+        backoff = backoff_delay(attempt, _retry_after(error))
+        logger.warning(
+            f"Error adding batch of {len(batch)} items (attempt {attempt}/{config.MAX_RETRIES}). "
+            f"Retrying in {backoff:.2f}s... {error}"
+        )
+        await asyncio.sleep(backoff)
+
+    if not failed:
+        stats.succeeded += len(batch)
+        return
+
+    await _resend_failed(workqueue, batch, payload, failed, stats, limiter, executor, logger)
+
+
+async def _resend_failed(
+    workqueue: Workqueue,
+    batch: list[dict],
+    payload: list[dict],
+    failed: list[str],
+    stats: EnqueueStats,
+    limiter: AdaptiveLimiter,
+    executor: ThreadPoolExecutor,
+    logger: logging.Logger,
+) -> None:
+    """
+    Resend the items of a batch the server reported as failed, in halves, so a bad item only fails itself.
+    Failed items are matched by reference, one item per reported reference. Items without a reference
+    cannot be told apart from the ones that were added, so they are counted as failed and not resent.
+    """
+    remaining = Counter(failed)
+    blank_failed = min(remaining.pop("", 0), sum(not entry["reference"] for entry in payload))
+    rejected = []
+    for it, entry in zip(batch, payload, strict=True):
+        if entry["reference"] and remaining[entry["reference"]] > 0:
+            remaining[entry["reference"]] -= 1
+            rejected.append(it)
+
+    stats.succeeded += len(batch) - len(rejected) - blank_failed
+
+    if blank_failed:
+        logger.error(f"{blank_failed} items without a reference reported as failed by the server, not resent")
+        stats.failed += blank_failed
+
+    if not rejected:
+        return
+
+    if len(rejected) == 1 and len(batch) == 1:
+        logger.error(f"Failed to add item {payload[0]['reference']}: reported as failed by the server")
+        stats.failed += 1
+        stats.failed_references.append(payload[0]["reference"])
+        return
+
+    if len(rejected) == 1:
+        await _send_batch(workqueue, rejected, stats, limiter, executor, logger)
+        return
+
+    logger.warning(f"{len(rejected)} of {len(batch)} items not added, resending them in smaller batches")
+    middle = len(rejected) // 2
+    await _send_batch(workqueue, rejected[:middle], stats, limiter, executor, logger)
+    await _send_batch(workqueue, rejected[middle:], stats, limiter, executor, logger)
+
+
+async def _read_source(source: Iterable[dict] | AsyncIterable[dict], buffer: asyncio.Queue) -> None:
+    """Put the items of the source on the buffer, waiting whenever it is full."""
+    try:
+        if isinstance(source, AsyncIterable):
+            async for item in source:
+                await buffer.put(item)
+        else:
+            for item in source:
+                await buffer.put(item)
+    except Exception:
+        # Let the consumer finish the items read so far, the error is raised when the producer is awaited
+        await buffer.put(_END)
+        raise
+
+    await buffer.put(_END)
+
+
+async def _next_batch(buffer: asyncio.Queue) -> list[dict]:
+    """
+    Wait for the next item, then take whatever else is already buffered, up to
+    config.ENQUEUE_BATCH_SIZE. A slow source gives small batches that go out at once,
+    a fast one gives full batches. An empty list means the source is exhausted.
+    """
+    batch = []
+    item = await buffer.get()
+
+    while item is not _END:
+        batch.append(item)
+        if len(batch) >= config.ENQUEUE_BATCH_SIZE or buffer.empty():
+            return batch
+        item = buffer.get_nowait()
+
+    # Leave the end marker for the next call
+    buffer.put_nowait(_END)
+    return batch
+
+
 async def concurrent_add(
-    workqueue: Workqueue, items: list[dict], logger: logging.Logger
+    workqueue: Workqueue,
+    items: Iterable[dict] | AsyncIterable[dict],
+    logger: logging.Logger,
+    index: WorkqueueReferenceIndex | None = None,
 ) -> None:
     """
     Populate the workqueue with items to be processed.
-    Uses concurrency and retries with exponential backoff.
+    Items are read from the source by a producer task into a buffer of
+    config.ENQUEUE_BUFFER_SIZE items, and sent in bulk requests of up to
+    config.ENQUEUE_BATCH_SIZE as they arrive. The producer waits while the buffer is
+    full, so memory is bounded by the buffer and the batches in flight, not the dataset.
+    The number of requests in flight is set by an adaptive limiter between
+    config.MIN_CONCURRENCY and config.MAX_CONCURRENCY, which grows while the backend
+    answers quickly and backs off when it slows down or throttles.
 
     Args:
         workqueue (Workqueue): The workqueue to populate.
-        items (list[dict]): List of items to add to the queue.
+        items (Iterable[dict] | AsyncIterable[dict]): Items to add to the queue, e.g. from
+            retrieve_items_for_queue or stream_items_for_queue.
         logger (logging.Logger): Logger for logging messages.
+        index (WorkqueueReferenceIndex | None): If given, items whose reference is already
+            in the index are skipped. Sync the index before calling.
 
     Returns:
         None
-
-    Raises:
-        Exception: If adding an item fails after all retries.
     """
-    sem = asyncio.Semaphore(config.MAX_CONCURRENCY)
-
-    async def add_one(it: dict):
-        reference = str(it.get("reference") or "")
-        data = {"item": it}
-
-        async with sem:
-            for attempt in range(1, config.MAX_RETRIES + 1):
-                try:
-                    await asyncio.to_thread(workqueue.add_item, data, reference)
-                    return True
-                except Exception as e:
-                    if attempt >= config.MAX_RETRIES:
-                        logger.error(
-                            f"Failed to add item {reference} after {attempt} attempts: {e}"
-                        )
-                        return False
-                    backoff = config.RETRY_BASE_DELAY * (2 ** (attempt - 1))
-                    logger.warning(
-                        f"Error adding {reference} (attempt {attempt}/{config.MAX_RETRIES}). "
-                        f"Retrying in {backoff:.2f}s... {e}"
-                    )
-                    await asyncio.sleep(backoff)
-
-    if not items:
+    stats = EnqueueStats()
+    limiter = AdaptiveLimiter()
+    tasks: set[asyncio.Task] = set()
+    loop = asyncio.get_running_loop()
+
+    # The blocking requests get their own threads, so the limiter and not the default executor sets the concurrency
+    executor = ThreadPoolExecutor(max_workers=config.MAX_CONCURRENCY)
+
+    buffer: asyncio.Queue = asyncio.Queue(maxsize=config.ENQUEUE_BUFFER_SIZE)
+    producer = asyncio.create_task(_read_source(items, buffer))
+
+    try:
+        while True:
+            # Only take the next batch when there is room for it under the current limit
+            while len(tasks) >= limiter.limit:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+            batch = await _next_batch(buffer)
+            if not batch:
+                break
+
+            if index is not None:
+                existing = await loop.run_in_executor(
+                    executor, index.contains, [str(it.get("reference") or "") for it in batch]
+                )
+                if existing:
+                    new = [it for it in batch if str(it.get("reference") or "") not in existing]
+                    stats.skipped += len(batch) - len(new)
+                    batch = new
+                if not batch:
+                    continue
+
+            task = asyncio.create_task(_send_batch(workqueue, batch, stats, limiter, executor, logger))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        # Raise any error from reading the source
+        await producer
+    finally:
+        producer.cancel()
+        if tasks:
+            await asyncio.gather(*tasks)
+        executor.shutdown(wait=False)
+
+    total = stats.succeeded + stats.failed
+    if stats.skipped:
+        logger.info(f"Skipped {stats.skipped} items already in the queue.")
+    if not total:
         logger.info("No new items to add.")
         return
 
-    results = await asyncio.gather(*(add_one(i) for i in items))
-    successes = sum(1 for r in results if r)
-    failures = len(results) - successes
     logger.info(
-        f"Summary: {successes} succeeded, {failures} failed out of {len(results)}"
+        f"Summary: {stats.succeeded} succeeded, {stats.failed} failed out of {total} "
+        f"({stats.requests} requests, {stats.retries} retries, final concurrency {limiter.limit})"
     )
@@ -0,0 +1,205 @@
+"""Module to process work items in parallel"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from automation_server_client import WorkItem, Workqueue
+from mbu_rpa_core.exceptions import BusinessError, ProcessError
+
+from helpers import config
+from helpers.adaptive_limiter import backoff_delay
+from helpers.ats_functions import get_item_info
+from processes.error_handling import ErrorContext, handle_error
+from processes.process_item import process_item
+from processes.worker_context import close_worker_sharepoint, init_worker
+
+@dataclass
+class ProcessingStats:
+    """Running totals for a processing run, shared by all workers"""
+
+    completed: int = 0
+    business_errors: int = 0
+    process_errors: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def count(self, outcome: str) -> None:
+        """Add one to the completed, business_errors or process_errors total."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+
+def _as_process_error(e: Exception) -> ProcessError:
+    """Wrap an unexpected error in a ProcessError with it as the cause, so its type and traceback are kept."""
+    if isinstance(e, ProcessError):
+        return e
+    process_error = ProcessError(str(e))
+    process_error.__cause__ = e
+    return process_error
+
+
+def _with_retries(report: Callable[[str], object], message: str, logger: logging.Logger) -> None:
+    """Report an item's result, retrying if the Automation Server cannot be reached."""
+    for attempt in range(1, config.MAX_RETRIES + 1):
+        try:
+            report(message)
+            return
+        except Exception as e:
+            if attempt >= config.MAX_RETRIES:
+                raise
+            backoff = backoff_delay(attempt)
+            logger.warning(
+                f"Error reporting item result (attempt {attempt}/{config.MAX_RETRIES}). "
+                f"Retrying in {backoff:.2f}s... {e}"
+            )
+            time.sleep(backoff)
+
+
+def _run_item(
+    item: WorkItem,
+    stats: ProcessingStats,
+    logger: logging.Logger,
+    process_name: str | None,
+) -> None:
+    """
+    Process one item and give it exactly one result: complete on success, pending user on a
+    BusinessError, and failed on any other error. Errors go through handle_error; if that
+    raises before the item got its result, the item is failed directly.
+    """
+    try:
+        data, reference = get_item_info(item)
+        process_item(data, reference)
+    except Exception as e:
+        if isinstance(e, BusinessError):
+            error, outcome, report, log, send_mail = e, "business_errors", item.pending_user, logger.info, False
+        else:
+            error = _as_process_error(e)
+            outcome, report, log, send_mail = "process_errors", item.fail, logger.error, True
+
+        reported = False
+
+        def action(message: str) -> None:
+            nonlocal reported
+            _with_retries(report, message, logger)
+            reported = True
+
+        stats.count(outcome)
+        context = ErrorContext(item=item, action=action, send_mail=send_mail, process_name=process_name)
+        try:
+            handle_error(error=error, log=log, context=context)
+        except Exception as handling_error:
+            logger.error(f"Error handling failed for item {item}: {handling_error}")
+            if not reported:
+                _with_retries(item.fail, str(error), logger)
+        return
+
+    _with_retries(item.complete, "Completed", logger)
+    stats.count("completed")
+
+
+def _work(
+    workqueue: Workqueue,
+    stop: threading.Event,
+    stats: ProcessingStats,
+    logger: logging.Logger,
+    process_name: str | None,
+) -> None:
+    """
+    Claim and process items one at a time until the queue is empty or a stop is requested.
+    The worker's Sharepoint client is closed when it exits.
+    """
+    try:
+        failed_claims = 0
+
+        while not stop.is_set():
+            try:
+                item = workqueue.get_next_item()
+            except Exception as e:
+                failed_claims += 1
+                if failed_claims >= config.MAX_RETRIES:
+                    logger.error(f"Worker stopping after {failed_claims} failed attempts to claim an item: {e}")
+                    return
+                backoff = backoff_delay(failed_claims)
+                logger.warning(
+                    f"Error claiming item (attempt {failed_claims}/{config.MAX_RETRIES}). "
+                    f"Retrying in {backoff:.2f}s... {e}"
+                )
+                stop.wait(backoff)
+                continue
+
+            failed_claims = 0
+            if item is None:
+                return
+
+            try:
+                _run_item(item, stats, logger, process_name)
+            except Exception as e:
+                # The item could not be given a result; it stays in progress on the server
+                logger.error(f"Failed to report the result of item {item}: {e}")
+    finally:
+        close_worker_sharepoint()
+
+
+def process_workqueue(
+    workqueue: Workqueue,
+    logger: logging.Logger,
+    process_name: str | None = None,
+    max_workers: int = config.WORKER_COUNT,
+    stop: threading.Event | None = None,
+    **sharepoint_kwargs,
+) -> ProcessingStats:
+    """
+    Process the items of the workqueue with process_item on a pool of worker threads.
+    Each worker claims its next item only when it is free, so no item is held without
+    being worked on, and has its own Sharepoint client through worker_sharepoint
+    (from processes.worker_context).
+    Threads suit the mostly I/O-bound item work, which releases the GIL while waiting.
+
+    Setting the stop event, or Ctrl+C, stops the claiming of new items; the items being
+    processed are finished and given their result before the function returns.
+
+    Args:
+        workqueue (Workqueue): The workqueue to process.
+        logger (logging.Logger): Logger for logging messages.
+        process_name (str | None): Name of the process, used in error emails.
+        max_workers (int): Number of items processed at the same time.
+        stop (threading.Event | None): Event that stops the workers when set, e.g. from a signal handler.
+        **sharepoint_kwargs: Keyword arguments for each worker's Sharepoint client
+            (tenant, client_id, thumbprint, cert_path, site_url, site_name, document_library).
+
+    Returns:
+        ProcessingStats: The number of completed items and of business and process errors.
+    """
+    stats = ProcessingStats()
+    stop = stop or threading.Event()
+    start = time.perf_counter()
+
+    pool = ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="worker",
+        initializer=init_worker,
+        initargs=(sharepoint_kwargs,),
+    )
+    futures = [pool.submit(_work, workqueue, stop, stats, logger, process_name) for _ in range(max_workers)]
+
+    try:
+        for future in futures:
+            future.result()
+    except KeyboardInterrupt:
+        logger.warning("Stopping: workers finish their current item and claim no more")
+        raise
+    finally:
+        stop.set()
+        pool.shutdown(wait=True)
+
+        total = stats.completed + stats.business_errors + stats.process_errors
+        logger.info(
+            f"Summary: {stats.completed} completed, {stats.business_errors} business errors, "
+            f"{stats.process_errors} process errors out of {total} "
+            f"({max_workers} workers, {time.perf_counter() - start:.1f}s)"
+        )
+
+    return stats
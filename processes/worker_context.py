@@ -0,0 +1,48 @@
+"""Module holding the per-worker state of process_workqueue, importable from process_item"""
+
+import threading
+
+from helpers.sharepoint_class import Sharepoint
+
+# Per worker thread: the Sharepoint settings and the client built from them
+_worker = threading.local()
+
+
+def worker_sharepoint() -> Sharepoint:
+    """
+    The Sharepoint client of the current worker.
+    Each worker authenticates on first use and reuses its client for every item it
+    processes, so clients are never shared between threads. Call it from process_item.
+
+    Raises:
+        RuntimeError: If called outside a worker, or if authentication fails. The item then
+            fails, and the next item on the worker tries to authenticate again.
+    """
+    sp = getattr(_worker, "sharepoint", None)
+    if sp is not None:
+        return sp
+
+    sharepoint_kwargs = getattr(_worker, "sharepoint_kwargs", None)
+    if sharepoint_kwargs is None:
+        raise RuntimeError("worker_sharepoint can only be used by items run through process_workqueue")
+
+    sp = Sharepoint(**sharepoint_kwargs)
+    if sp.ctx is None:
+        raise RuntimeError(f"Failed to authenticate to SharePoint: {sp.auth_error}")
+
+    _worker.sharepoint = sp
+    return sp
+
+
+def init_worker(sharepoint_kwargs: dict) -> None:
+    """Set the Sharepoint settings of the current worker; the client is built on first use."""
+    _worker.sharepoint_kwargs = sharepoint_kwargs
+    _worker.sharepoint = None
+
+
+def close_worker_sharepoint() -> None:
+    """Close the current worker's Sharepoint client, if it built one."""
+    sp = getattr(_worker, "sharepoint", None)
+    _worker.sharepoint = None
+    if sp is not None:
+        sp.close()
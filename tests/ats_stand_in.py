@@ -0,0 +1,172 @@
+"""
+A local stand-in for the Automation Server workqueue API, for testing queue population without a real server.
+
+It serves the routes the process uses: the bulk endpoint, single item adds and paged item listing, and keeps
+the items in memory. Failure modes can be switched on per test to reproduce a server without the bulk
+endpoint, rejected items and outages.
+
+Usage:
+    with AtsStandIn() as server:
+        os.environ["ATS_URL"] = server.url
+        server.reject = {"bad-ref"}
+        ...
+        print(server.items[1], server.requests)
+"""
+
+import json
+import threading
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from helpers import config
+
+
+class AtsStandIn:  # pylint: disable=too-many-instance-attributes
+    """
+    An in-memory workqueue API served over HTTP on a free local port.
+
+    Attributes:
+        items (dict[int, list[dict]]): The items added to each workqueue, in order.
+        requests (Counter): Number of requests per route ("bulk", "add", "list").
+        bulk_supported (bool): If False, the bulk endpoint answers 404 like an older server.
+        reject (set[str]): References the server refuses to add.
+        reject_if (Callable[[dict], bool]): Refuses the items it returns True for, given the item's
+            data, e.g. to refuse items without a reference.
+        reject_whole_batch (bool): If True, a bulk request containing a rejected reference is refused
+            as a whole with 422; otherwise the other items are added and the rejected ones reported as failed.
+        outage_status (int | None): If set, every POST is answered with this status (e.g. 503).
+    """
+
+    def __init__(self):
+        self.items: dict[int, list[dict]] = defaultdict(list)
+        self.requests: Counter = Counter()
+        self.bulk_supported = True
+        self.reject: set[str] = set()
+        self.reject_if: Callable[[dict], bool] = lambda data: False
+        self.reject_whole_batch = False
+        self.outage_status: int | None = None
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base url to use as ATS_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def workqueue(self, workqueue_id: int) -> "StandInWorkqueue":
+        """A workqueue client whose single item adds go to this server."""
+        return StandInWorkqueue(workqueue_id, self.url)
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Routes requests to the stand-in"""
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                return
+
+            def _reply(self, status: int, payload=None):
+                body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """GET /workqueues/{id}/items?page=&size="""
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/")
+                if len(parts) != 3 or parts[0] != "workqueues" or parts[2] != "items":
+                    self._reply(404)
+                    return
+
+                query = parse_qs(url.query)
+                page = int(query.get("page", ["1"])[0])
+                size = int(query.get("size", [str(config.WORKQUEUE_PAGE_SIZE)])[0])
+                with stand_in.lock:
+                    stand_in.requests["list"] += 1
+                    items = stand_in.items[int(parts[1])]
+                    page_items = [
+                        {"id": i + 1, **item} for i, item in enumerate(items[(page - 1) * size:page * size], (page - 1) * size)
+                    ]
+                    total = len(items)
+
+                self._reply(200, {"items": page_items, "total_items": total})
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                """POST /workqueues/{id}/<bulk endpoint> and /workqueues/{id}/add"""
+                parts = urlparse(self.path).path.strip("/").split("/", 2)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"null")
+
+                if len(parts) != 3 or parts[0] != "workqueues":
+                    self._reply(404)
+                    return
+
+                workqueue_id, route = int(parts[1]), parts[2]
+                kind = "bulk" if route == config.WORKQUEUE_BULK_ENDPOINT else "add" if route == "add" else None
+                with stand_in.lock:
+                    if kind:
+                        stand_in.requests[kind] += 1
+
+                if kind is None or (kind == "bulk" and not stand_in.bulk_supported):
+                    self._reply(404)
+                    return
+
+                if stand_in.outage_status:
+                    self._reply(stand_in.outage_status)
+                    return
+
+                entries = body if kind == "bulk" else [body]
+                refused = [
+                    entry.get("reference") in stand_in.reject
+                    or stand_in.reject_if(entry.get("data"))
+                    for entry in entries
+                ]
+                rejected = [entry["reference"] for entry, refuse in zip(entries, refused) if refuse]
+
+                if rejected and (kind == "add" or stand_in.reject_whole_batch):
+                    self._reply(400 if kind == "add" else 422, {"detail": f"Rejected references: {rejected}"})
+                    return
+
+                with stand_in.lock:
+                    stand_in.items[workqueue_id].extend(
+                        {"reference": entry.get("reference"), "data": entry.get("data")}
+                        for entry, refuse in zip(entries, refused)
+                        if not refuse
+                    )
+
+                self._reply(200, {"failed": rejected} if kind == "bulk" else {})
+
+        return Handler
+
+
+class StandInWorkqueue:
+    """The part of automation_server_client.Workqueue used by queue population"""
+
+    def __init__(self, workqueue_id: int, url: str):
+        self.id = workqueue_id
+        self.url = url
+
+    def add_item(self, data: dict, reference: str):
+        """Add a single item, raising requests.HTTPError if it is refused."""
+        response = requests.post(
+            f"{self.url}/workqueues/{self.id}/add", json={"reference": reference, "data": data}, timeout=30
+        )
+        response.raise_for_status()
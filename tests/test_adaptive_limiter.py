@@ -0,0 +1,37 @@
+"""Tests for the adaptive concurrency limiter"""
+
+import unittest
+
+from helpers.adaptive_limiter import AdaptiveLimiter
+
+
+class AdaptiveLimiterTests(unittest.IsolatedAsyncioTestCase):
+    """AdaptiveLimiter.record: growth, back-off and latency baselines per request size"""
+
+    async def test_limit_grows_while_latency_is_stable(self):
+        """Steady latencies raise the limit by about one per round trip."""
+        limiter = AdaptiveLimiter(min_limit=1, max_limit=10, initial_limit=1)
+        for _ in range(30):
+            await limiter.record(0.1, size=500)
+
+        self.assertGreater(limiter.limit, 4)
+
+    async def test_throttling_halves_the_limit(self):
+        """A throttled request halves the limit."""
+        limiter = AdaptiveLimiter(min_limit=1, max_limit=100, initial_limit=40)
+        await limiter.record(0.1, throttled=True, size=500)
+
+        self.assertEqual(limiter.limit, 20)
+
+    async def test_small_request_does_not_set_the_baseline_for_large_ones(self):
+        """A fast 1-item request is not the yardstick for 500-item requests."""
+        limiter = AdaptiveLimiter(min_limit=1, max_limit=10, initial_limit=1)
+        await limiter.record(0.01, size=1)
+        for _ in range(30):
+            await limiter.record(0.1, size=500)
+
+        self.assertGreater(limiter.limit, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
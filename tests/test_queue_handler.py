@@ -0,0 +1,167 @@
+"""Tests for queue population against the local Automation Server stand-in"""
+
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from helpers import ats_functions, config
+from processes.queue_handler import concurrent_add
+from tests.ats_stand_in import AtsStandIn
+
+logger = logging.getLogger(__name__)
+
+
+def _items(count: int, prefix: str = "ref") -> list[dict]:
+    return [{"reference": f"{prefix}-{i}", "data": {"value": i}} for i in range(count)]
+
+
+class ConcurrentAddTests(unittest.IsolatedAsyncioTestCase):
+    """concurrent_add: bulk posting, splitting of rejected batches, per-item fallback and outages"""
+
+    def setUp(self):
+        self.server = self.enterContext(AtsStandIn())
+
+        patches = [
+            mock.patch.dict(os.environ, {"ATS_URL": self.server.url, "ATS_TOKEN": "test-token"}),
+            mock.patch.object(config, "ENQUEUE_BATCH_SIZE", 100),
+            mock.patch.object(config, "RETRY_BASE_DELAY", 0.001),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        ats_functions._ats_settings.cache_clear()  # pylint: disable=protected-access
+        ats_functions._ats_session.cache_clear()  # pylint: disable=protected-access
+        self.addCleanup(ats_functions._ats_settings.cache_clear)  # pylint: disable=protected-access
+        self.addCleanup(ats_functions._ats_session.cache_clear)  # pylint: disable=protected-access
+
+        self.workqueue = self.server.workqueue(1)
+
+    def references(self) -> list[str]:
+        """The references stored by the stand-in, in order."""
+        return [item["reference"] for item in self.server.items[1]]
+
+    async def test_items_are_sent_in_bulk_batches(self):
+        """Items go out in bulk requests of ENQUEUE_BATCH_SIZE."""
+        await concurrent_add(self.workqueue, _items(1000), logger)
+
+        self.assertEqual(sorted(self.references()), sorted(item["reference"] for item in _items(1000)))
+        self.assertEqual(self.server.requests["bulk"], 10)
+        self.assertEqual(self.server.requests["add"], 0)
+
+    async def test_reported_failures_only_fail_themselves(self):
+        """Items the server reports as failed are retried alone and fail without taking their batch down."""
+        self.server.reject = {"ref-13", "ref-77"}
+
+        with self.assertLogs(level="ERROR") as logs:
+            await concurrent_add(self.workqueue, _items(300), logger)
+
+        self.assertEqual(len(self.references()), 298)
+        self.assertNotIn("ref-13", self.references())
+        self.assertEqual(sum("ref-13" in line for line in logs.output), 1)
+        self.assertEqual(sum("ref-77" in line for line in logs.output), 1)
+
+    async def test_rejected_batches_are_split_until_the_bad_item_is_isolated(self):
+        """A batch refused with a 4xx is halved until only the bad item fails."""
+        self.server.reject = {"ref-42"}
+        self.server.reject_whole_batch = True
+
+        with self.assertLogs(level="ERROR") as logs:
+            await concurrent_add(self.workqueue, _items(300), logger)
+
+        self.assertEqual(len(self.references()), 299)
+        self.assertNotIn("ref-42", self.references())
+        self.assertEqual(sum("ref-42" in line for line in logs.output if "ERROR" in line), 1)
+        # The two clean batches go through at once, the third is halved down to the bad item
+        self.assertLessEqual(self.server.requests["bulk"], 3 + 2 * 7)
+
+    async def test_items_are_added_one_at_a_time_without_the_bulk_endpoint(self):
+        """Without the bulk endpoint, items fall back to single adds."""
+        self.server.bulk_supported = False
+        self.server.reject = {"ref-3"}
+
+        with self.assertLogs(level="WARNING"):
+            await concurrent_add(self.workqueue, _items(30), logger)
+
+        self.assertEqual(len(self.references()), 29)
+        self.assertEqual(self.server.requests["add"], 30)
+
+    async def test_outage_fails_each_batch_once_without_splitting(self):
+        """After the transient retries, each batch fails once instead of being split into more requests."""
+        self.server.outage_status = 503
+
+        with self.assertLogs(level="ERROR") as logs:
+            await concurrent_add(self.workqueue, _items(500), logger)
+
+        self.assertEqual(self.references(), [])
+        self.assertEqual(self.server.requests["bulk"], 5 * config.MAX_RETRIES)
+        self.assertEqual(sum("Failed to add batch of 100 items" in line for line in logs.output), 5)
+
+    async def test_refused_requests_fail_each_batch_once(self):
+        """A 401 is not a bad payload, so batches are failed as a whole instead of being split."""
+        self.server.outage_status = 401
+
+        with self.assertLogs(level="ERROR") as logs:
+            await concurrent_add(self.workqueue, _items(300), logger)
+
+        self.assertEqual(self.server.requests["bulk"], 3)
+        self.assertEqual(sum("Failed to add batch of 100 items" in line for line in logs.output), 3)
+
+    async def test_items_without_reference_are_not_resent(self):
+        """A failed item without a reference is counted as failed, and the other blank-reference items are not resent."""
+        self.server.reject_if = lambda data: data["item"]["data"]["value"] == 3
+        items = [{"data": {"value": i}} for i in range(10)]
+
+        with self.assertLogs(level="ERROR") as logs:
+            await concurrent_add(self.workqueue, items, logger)
+
+        self.assertEqual(self.server.requests["bulk"], 1)
+        self.assertEqual(len(self.server.items[1]), 9)
+        self.assertEqual(len([line for line in logs.output if "ERROR" in line]), 1)
+
+    async def test_async_source_skips_references_already_in_the_queue(self):
+        """An async source streams through, and references already in the synced index are skipped."""
+        await concurrent_add(self.workqueue, _items(50), logger)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index = ats_functions.WorkqueueReferenceIndex(1, os.path.join(temp_dir, "index.sqlite3"))
+            index.sync()
+
+            async def source():
+                for item in _items(60):
+                    yield item
+
+            with self.assertLogs(logger, level="INFO") as logs:
+                await concurrent_add(self.workqueue, source(), logger, index=index)
+
+        self.assertEqual(sorted(self.references()), sorted(item["reference"] for item in _items(60)))
+        self.assertIn("Skipped 50 items already in the queue.", logs.output[0])
+
+    async def test_index_keeps_servers_with_the_same_queue_id_apart(self):
+        """Two servers with the same workqueue id share an index file without mixing their references."""
+        other = self.enterContext(AtsStandIn())
+        other.items[1].extend({"reference": f"other-{i}", "data": {}} for i in range(5))
+        await concurrent_add(self.workqueue, _items(10), logger)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "index.sqlite3")
+            index = ats_functions.WorkqueueReferenceIndex(1, db_path)
+            index.sync()
+
+            with mock.patch.dict(os.environ, {"ATS_URL": other.url}):
+                ats_functions._ats_settings.cache_clear()  # pylint: disable=protected-access
+                other_index = ats_functions.WorkqueueReferenceIndex(1, db_path)
+                other_index.sync()
+                other_references = other_index.references()
+            ats_functions._ats_settings.cache_clear()  # pylint: disable=protected-access
+
+            references = index.references()
+
+        self.assertEqual(references, {item["reference"] for item in _items(10)})
+        self.assertEqual(other_references, {f"other-{i}" for i in range(5)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Tests for SharePoint $batch requests, with the response built in memory"""
+
+import unittest
+from types import SimpleNamespace
+
+import requests
+
+from helpers.sharepoint_batch import SharepointBatch, _parse_batch_response
+
+
+def _http_part(status: str, body: bytes, headers: str = "Content-Type: application/octet-stream") -> bytes:
+    return (
+        b"Content-Type: application/http\r\nContent-Transfer-Encoding: binary\r\n\r\n"
+        + f"HTTP/1.1 {status}\r\n{headers}\r\n\r\n".encode()
+        + body
+        + b"\r\n"
+    )
+
+
+def _batch_body(boundary: str, parts: list[bytes]) -> bytes:
+    return b"".join(f"--{boundary}\r\n".encode() + part for part in parts) + f"--{boundary}--\r\n".encode()
+
+
+def _changeset(boundary: str, part: bytes) -> bytes:
+    return f"Content-Type: multipart/mixed; boundary={boundary}\r\n\r\n".encode() + _batch_body(boundary, [part])
+
+
+class FakeSharepoint:
+    """The part of Sharepoint used by SharepointBatch, answering every $batch request with `body`"""
+
+    site_name = "site"
+    document_library = "Docs"
+    ctx = SimpleNamespace(service_root_url="https://tenant.sharepoint.com/teams/site/_api")
+
+    def __init__(self, body: bytes, boundary: str = "batchresponse_1"):
+        self.response = requests.Response()
+        self.response.status_code = 200
+        self.response._content = body  # pylint: disable=protected-access
+        self.response.headers["Content-Type"] = f"multipart/mixed; boundary={boundary}"
+
+    def send_with_retry(self, send, max_retries):  # pylint: disable=unused-argument
+        """Return the canned response without sending anything."""
+        return self.response, 0
+
+
+class ParseBatchResponseTests(unittest.TestCase):
+    """_parse_batch_response: parts in request order, with change sets flattened"""
+
+    def test_parts_are_returned_in_order_with_change_sets_flattened(self):
+        """Each part gives its status, lower-cased headers and body, change set parts included."""
+        body = _batch_body(
+            "batch_1",
+            [
+                _http_part("200 OK", b"first"),
+                _changeset("changeset_1", _http_part("204 No Content", b"")),
+                _http_part("404 Not Found", b"missing", headers="Retry-After: 5"),
+            ],
+        )
+
+        parts = _parse_batch_response(body, "multipart/mixed; boundary=batch_1")
+
+        self.assertEqual([status for status, _, _ in parts], [200, 204, 404])
+        self.assertEqual(parts[0][2], b"first")
+        self.assertEqual(parts[2][1], {"retry-after": "5"})
+
+
+class SharepointBatchTests(unittest.TestCase):
+    """SharepointBatch: results stored on the operations they belong to"""
+
+    def test_results_are_stored_on_their_operations(self):
+        """Reads get their content, failures their error body."""
+        sharepoint = FakeSharepoint(
+            _batch_body("batchresponse_1", [_http_part("200 OK", b"data"), _http_part("404 Not Found", b"gone")])
+        )
+
+        with SharepointBatch(sharepoint, max_retries=0) as batch:
+            found = batch.read_file("a.txt", "Folder")
+            missing = batch.read_file("b.txt", "Folder")
+
+        self.assertEqual((found.success, found.result), (True, b"data"))
+        self.assertEqual((missing.success, missing.error), (False, "gone"))
+
+    def test_operations_without_a_response_part_get_an_error(self):
+        """A response with fewer parts than operations leaves no operation without a status or an error."""
+        sharepoint = FakeSharepoint(_batch_body("batchresponse_1", [_http_part("200 OK", b"data")]))
+
+        with SharepointBatch(sharepoint, max_retries=0) as batch:
+            operations = [batch.read_file(name, "Folder") for name in ("a.txt", "b.txt", "c.txt")]
+
+        self.assertTrue(operations[0].success)
+        for operation in operations[1:]:
+            self.assertFalse(operation.success)
+            self.assertIn("1 parts for 3 operations", operation.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Tests for the ETag-validated local file cache"""
+
+import shutil
+import tempfile
+import unittest
+
+from helpers.sharepoint_cache import FileCache
+
+
+class FileCacheTests(unittest.TestCase):
+    """FileCache: memory and disk tiers, LRU eviction and persistence between runs"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def test_content_is_returned_with_its_etag(self):
+        """A stored file is returned with its ETag, and a missing one as None."""
+        cache = FileCache(self.cache_dir)
+        cache.put("/a.xlsx", '"1"', b"content")
+
+        self.assertEqual(cache.get("/a.xlsx"), ('"1"', b"content"))
+        self.assertIsNone(cache.get("/b.xlsx"))
+
+    def test_files_on_disk_are_found_by_a_new_cache(self):
+        """Files cached by an earlier run are served from disk."""
+        FileCache(self.cache_dir, memory_max_file_bytes=0).put("/a.xlsx", '"1"', b"content")
+
+        self.assertEqual(FileCache(self.cache_dir).get("/a.xlsx"), ('"1"', b"content"))
+
+    def test_least_recently_used_files_are_evicted_from_disk(self):
+        """Beyond max_bytes, the file read longest ago is evicted first."""
+        cache = FileCache(self.cache_dir, max_bytes=10, memory_max_file_bytes=0)
+        cache.put("/a", '"a"', b"aaaa")
+        cache.put("/b", '"b"', b"bbbb")
+        cache.get("/a")
+        cache.put("/c", '"c"', b"cccc")
+
+        self.assertIsNotNone(cache.get("/a"))
+        self.assertIsNone(cache.get("/b"))
+        self.assertIsNotNone(cache.get("/c"))
+
+    def test_memory_tier_evicts_without_losing_the_disk_copy(self):
+        """A file evicted from memory is still read from disk."""
+        cache = FileCache(self.cache_dir, memory_max_bytes=4, memory_max_file_bytes=4)
+        cache.put("/a", '"a"', b"aaaa")
+        cache.put("/b", '"b"', b"bbbb")
+
+        self.assertEqual(cache.get("/a"), ('"a"', b"aaaa"))
+
+    def test_invalidate_removes_a_file(self):
+        """An invalidated url is no longer cached, in this run or the next."""
+        cache = FileCache(self.cache_dir)
+        cache.put("/a", '"a"', b"aaaa")
+        cache.invalidate("/a")
+
+        self.assertIsNone(cache.get("/a"))
+        self.assertIsNone(FileCache(self.cache_dir).get("/a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
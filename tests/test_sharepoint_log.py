@@ -0,0 +1,157 @@
+"""Tests for the append-only SharePoint log sink, against an in-memory stand-in for the Sharepoint client"""
+
+import importlib.util
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+
+import pandas as pd
+import requests
+
+from helpers.sharepoint_log import SharepointLogSink
+
+
+class FakeBatch:
+    """The part of SharepointBatch used to read and delete segments; operations complete when queued"""
+
+    def __init__(self, sharepoint: "FakeSharepoint"):
+        self.sharepoint = sharepoint
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        return False
+
+    def read_file(self, file_name: str, folder_name: str):
+        """Read an uploaded file."""
+        return SimpleNamespace(success=True, result=self.sharepoint.uploads[f"{folder_name}/{file_name}"], error=None)
+
+    def delete_file(self, file_name: str, folder_name: str):
+        """Delete an uploaded file."""
+        del self.sharepoint.uploads[f"{folder_name}/{file_name}"]
+        return SimpleNamespace(success=True, error=None)
+
+
+class FakeSharepoint:
+    """The part of Sharepoint used to flush segments: uploads are kept in memory or fail while `down` is set"""
+
+    ctx = object()
+
+    def __init__(self):
+        self.down = False
+        self.uploads: dict[str, bytes] = {}
+        self.attempts = 0
+        self.listing_error: Exception | None = None
+
+    def upload_local_file(self, folder_name: str, local_file_path: str, _max_retries: int = 3):
+        """Store the file under folder/name, or fail like an unreachable site."""
+        self.attempts += 1
+        if self.down:
+            return SimpleNamespace(success=False, error="503 Service Unavailable")
+
+        with open(local_file_path, "rb") as file:
+            self.uploads[f"{folder_name}/{os.path.basename(local_file_path)}"] = file.read()
+        return SimpleNamespace(success=True, error=None)
+
+    def iter_files(self, folder_name: str):
+        """List the uploaded files of a folder, or raise listing_error if it is set."""
+        if self.listing_error:
+            raise self.listing_error
+        for path in self.uploads:
+            if path.startswith(f"{folder_name}/"):
+                yield {"Name": path.split("/", 1)[1]}
+
+    def batch(self, batch_size: int = 100, max_retries: int = 3):  # pylint: disable=unused-argument
+        """A batch whose operations run as they are queued."""
+        return FakeBatch(self)
+
+    def download_file_stream(self, folder_name: str, file_name: str, destination, max_retries: int = 3):  # pylint: disable=unused-argument
+        """Copy an uploaded file into destination, or raise a 404 like SharePoint."""
+        path = f"{folder_name}/{file_name}"
+        if path not in self.uploads:
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError("404 Not Found", response=response)
+        destination.write(self.uploads[path])
+
+
+class SharepointLogSinkTests(unittest.TestCase):
+    """SharepointLogSink: flushing, back-off after failed flushes and the buffer cap"""
+
+    def setUp(self):
+        self.sharepoint = FakeSharepoint()
+
+    def test_rows_are_flushed_as_segments(self):
+        """A full buffer is flushed as one segment, and close flushes the rest."""
+        with SharepointLogSink(self.sharepoint, "Logs", headers=["a"], flush_rows=10) as log:
+            for i in range(15):
+                log.write({"a": i})
+
+        self.assertEqual(len(self.sharepoint.uploads), 2)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_compaction_keeps_csv_values_as_text(self):
+        """Identifiers keep their leading zeros and empty values stay empty when CSV segments are compacted."""
+        log = SharepointLogSink(self.sharepoint, "Logs", headers=["cpr", "note"], flush_rows=1)
+        log.write({"cpr": "0101901234", "note": ""})
+        log.write({"cpr": "0202902345", "note": "login"})
+
+        with redirect_stdout(io.StringIO()):
+            merged = log.compact("audit.parquet")
+
+        compacted = pd.read_parquet(io.BytesIO(self.sharepoint.uploads["Logs/audit.parquet"]))
+        self.assertEqual(merged, 2)
+        self.assertEqual(compacted["cpr"].tolist(), ["0101901234", "0202902345"])
+        self.assertEqual(compacted["note"].tolist(), ["", "login"])
+        self.assertEqual(list(self.sharepoint.uploads), ["Logs/audit.parquet"])
+
+    def test_failed_scheduled_compaction_does_not_reach_the_writer(self):
+        """A listing error during scheduled compaction is reported, and the flushed segment stays uploaded."""
+        self.sharepoint.listing_error = RuntimeError("listing failed")
+        log = SharepointLogSink(
+            self.sharepoint, "Logs", headers=["a"], flush_rows=1, compact_to="audit.xlsx", compact_interval=0
+        )
+
+        with redirect_stdout(io.StringIO()) as output:
+            log.write({"a": 1})
+
+        self.assertEqual(len(self.sharepoint.uploads), 1)
+        self.assertIn("Failed to compact log segments in 'Logs': listing failed", output.getvalue())
+
+    def test_writes_do_not_retry_a_failed_flush_until_the_delay_has_passed(self):
+        """During an outage writes keep buffering instead of trying to flush on every call."""
+        self.sharepoint.down = True
+        log = SharepointLogSink(self.sharepoint, "Logs", headers=["a"], flush_rows=10, flush_interval=60)
+
+        with redirect_stdout(io.StringIO()) as output:
+            for i in range(1000):
+                log.write({"a": i})
+
+        self.assertEqual(self.sharepoint.attempts, 1)
+        self.assertIn("Failed to flush 10 log rows to 'Logs', retrying in 60s", output.getvalue())
+
+        self.sharepoint.down = False
+        log.close()
+        self.assertEqual(len(self.sharepoint.uploads), 1)
+        self.assertEqual(len(log._buffer), 0)  # pylint: disable=protected-access
+
+    def test_buffer_is_capped_by_dropping_the_oldest_rows(self):
+        """Beyond max_buffer_rows the oldest rows are dropped and counted."""
+        self.sharepoint.down = True
+        log = SharepointLogSink(self.sharepoint, "Logs", headers=["a"], flush_rows=10, max_buffer_rows=100)
+
+        with redirect_stdout(io.StringIO()):
+            for i in range(250):
+                log.write({"a": i})
+
+        buffered = list(log._buffer)  # pylint: disable=protected-access
+        self.assertEqual(len(buffered), 100)
+        self.assertEqual(buffered[0], (150,))
+        self.assertEqual(log.dropped_rows, 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
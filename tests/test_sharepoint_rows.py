@@ -0,0 +1,76 @@
+"""Tests for row validation and type coercion before rows are appended to a worksheet"""
+
+import unittest
+
+import pandas as pd
+
+from helpers.sharepoint_rows import RowValidationError, validate_rows
+
+
+class ValidateRowsTests(unittest.TestCase):
+    """validate_rows: mapping onto headers, coercion of typed columns and required values"""
+
+    def test_iso_dates_keep_their_day_and_month(self):
+        """Year-first dates are not read day first."""
+        values, report = validate_rows(
+            [{"b": "2024-01-05"}, {"b": "2024-01-05 13:45"}, {"b": "2024/01/05"}], ["b"], {"b": "datetime"}
+        )
+
+        self.assertEqual(report.accepted, 3)
+        self.assertEqual(
+            values,
+            [[pd.Timestamp("2024-01-05")], [pd.Timestamp("2024-01-05 13:45")], [pd.Timestamp("2024-01-05")]],
+        )
+
+    def test_day_first_dates_are_read_day_first(self):
+        """Danish dd-mm-yyyy dates are read with the day first."""
+        values, _ = validate_rows([{"b": "05-01-2024"}, {"b": "05/01/2024"}], ["b"], {"b": "datetime"})
+
+        self.assertEqual(values, [[pd.Timestamp("2024-01-05")], [pd.Timestamp("2024-01-05")]])
+
+    def test_invalid_dates_are_rejected(self):
+        """A value that is not a date rejects its row, and an empty value is left as an empty cell."""
+        values, report = validate_rows([{"b": "not a date"}, {"b": None}], ["b"], {"b": "datetime"})
+
+        self.assertEqual(values, [[None]])
+        self.assertEqual(report.failures, ["Row 0: b: not a valid datetime"])
+
+    def test_numbers_are_coerced_and_invalid_ones_rejected(self):
+        """Int columns reject fractions and text, float columns reject text."""
+        rows = [{"i": "3", "f": "1.5"}, {"i": "1.5", "f": "2"}, {"i": "abc", "f": "x"}]
+        values, report = validate_rows(rows, ["i", "f"], {"i": "int", "f": "float"})
+
+        self.assertEqual(values, [[3, 1.5]])
+        self.assertIsInstance(values[0][0], int)
+        self.assertEqual(
+            report.failures,
+            ["Row 1: i: not a valid int", "Row 2: i: not a valid int; f: not a valid float"],
+        )
+
+    def test_required_columns_must_have_a_value(self):
+        """A required column that is missing or empty rejects the row."""
+        rows = [{"a": "x", "b": 1}, {"a": "", "b": 2}, {"b": 3}]
+        values, report = validate_rows(rows, ["a", "b"], required_columns=["a"])
+
+        self.assertEqual(values, [["x", 1]])
+        self.assertEqual(len(report.rejected), 2)
+        self.assertTrue(all("a: missing required value" in failure for failure in report.failures))
+
+    def test_untyped_columns_are_kept_and_unknown_columns_reported(self):
+        """Untyped values pass through, missing ones become empty strings, and extra keys are reported."""
+        values, report = validate_rows([{"a": "0101", "extra": 1}], ["a", "b"])
+
+        self.assertEqual(values, [["0101", ""]])
+        self.assertEqual(report.unknown_columns, ["extra"])
+
+    def test_validation_error_summarizes_the_failures(self):
+        """RowValidationError carries the report and lists the failures in its message."""
+        _, report = validate_rows([{"i": "x"}], ["i"], {"i": "int"})
+        error = RowValidationError(report)
+
+        self.assertIs(error.report, report)
+        self.assertIn("Row 0: i: not a valid int", str(error))
+
+
+if __name__ == "__main__":
+    unittest.main()
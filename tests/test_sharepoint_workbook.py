@@ -0,0 +1,75 @@
+"""Tests for the in-memory worksheet helpers"""
+
+import unittest
+from datetime import datetime
+
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill
+
+from helpers.sharepoint_workbook import format_and_sort_sheet, remove_empty_rows
+
+
+def _sheet(*rows):
+    workbook = Workbook()
+    ws = workbook.active
+    for row in rows:
+        ws.append(row)
+    return ws
+
+
+def _values(ws):
+    return [list(row) for row in ws.iter_rows(min_row=2, values_only=True)]
+
+
+class RemoveEmptyRowsTests(unittest.TestCase):
+    """remove_empty_rows: compacting the rows below the header"""
+
+    def test_empty_rows_are_removed_and_the_order_kept(self):
+        """Interior and trailing empty rows go, the header and the order of the other rows stay."""
+        ws = _sheet(["a", "b"], [1, 2], [None, None], [3, None], [None, None])
+
+        remove_empty_rows(ws)
+
+        self.assertEqual(ws["A1"].value, "a")
+        self.assertEqual(_values(ws), [[1, 2], [3, None]])
+        self.assertEqual(ws.max_row, 3)
+
+
+class FormatAndSortSheetTests(unittest.TestCase):
+    """format_and_sort_sheet: sorting on coerced keys while the cells keep their values and styles"""
+
+    def test_rows_are_sorted_on_coerced_keys(self):
+        """Number-like text is sorted as numbers, descending when asked, and keeps its original values."""
+        ws = _sheet(["name", "amount"], ["a", "9"], ["b", "10"], ["c", "2"])
+
+        format_and_sort_sheet(ws, sorting_keys=[{"key": 1, "type": "int", "ascending": False}])
+
+        self.assertEqual(_values(ws), [["b", "10"], ["a", "9"], ["c", "2"]])
+
+    def test_cell_styles_move_with_their_rows(self):
+        """Fills and number formats follow their values to the new row."""
+        ws = _sheet(["name", "when"], ["b", datetime(2024, 1, 2)], ["a", 5])
+        ws["A2"].fill = PatternFill("solid", fgColor="FF0000")
+        ws["B2"].number_format = "dd-mm-yyyy"
+
+        format_and_sort_sheet(ws, sorting_keys=[{"key": "A", "type": "str"}])
+
+        self.assertEqual(_values(ws), [["a", 5], ["b", datetime(2024, 1, 2)]])
+        self.assertEqual(ws["B2"].number_format, "General")
+        self.assertEqual(ws["B3"].number_format, "dd-mm-yyyy")
+        self.assertEqual(ws["A3"].fill.fgColor.rgb, "00FF0000")
+        self.assertNotEqual(ws["A2"].fill.fgColor.rgb, "00FF0000")
+
+    def test_capped_column_widths_wrap_long_values(self):
+        """With a max width, wider columns are capped and their cells wrap."""
+        ws = _sheet(["id", "note"], [1, "x" * 50])
+
+        format_and_sort_sheet(ws, column_widths=20)
+
+        self.assertEqual(ws.column_dimensions["B"].width, 20)
+        self.assertTrue(ws["B2"].alignment.wrap_text)
+        self.assertFalse(ws["A2"].alignment.wrap_text)
+
+
+if __name__ == "__main__":
+    unittest.main()